@@ -2,68 +2,94 @@
 
 from typing import Any, TypedDict, Annotated
 from langgraph.graph import StateGraph, END
+from langgraph.checkpoint.memory import MemorySaver
+from langchain_core.runnables import RunnableConfig
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, ToolMessage
 from langchain_core.tools import BaseTool
-from models.local_llm import UnifiedLLM
-from tools.basic_tools import tools, get_tool_by_name
+from models.local_llm import get_shared_llm
+from tools.basic_tools import tools
+from config import (
+    AGENT_HOT_CONTEXT_MESSAGES, AGENT_COLD_RECALL_LIMIT,
+    AGENT_MAX_CONCURRENCY, AGENT_LLM_MAX_RETRIES, AGENT_TOOL_CACHE_TTL,
+    AGENT_PARALLEL_TOOLS, AGENT_CHECKPOINT_MAX_MESSAGES, AGENT_TRACE,
+)
+import asyncio
+import contextvars
+import inspect
+import itertools
 import json
 import logging
-import uuid
+import os
+import re
+import time
+import weakref
+from contextlib import aclosing
 
 logger = logging.getLogger(__name__)
 
+# orjson (Rust) parses small JSON several times faster than the stdlib; optional
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
-class AgentState(TypedDict):
-    """State definition for the agent"""
-    messages: list[BaseMessage]
-    current_tool: str | None
-    tool_input: dict | None
-    tool_call_id: str | None
+# Stream callback of the run in progress - a context variable rather than an agent
+# attribute, so concurrent runs on one shared agent each stream to their own caller
+_stream_callback_var: contextvars.ContextVar = contextvars.ContextVar("agent_stream_callback", default=None)
 
+# Max tokens buffered between generation and a slow astream() consumer before the
+# LLM stream is paused (backpressure instead of unbounded growth)
+_STREAM_QUEUE_MAX = 256
 
-class LocalGPUAgent:
-    """Agentic workflow using LangGraph with unified LLM"""
+# Appended to the system prompt when AGENT_PARALLEL_TOOLS is enabled
+_PARALLEL_TOOLS_RULE = """
 
-    def __init__(self):
-        self.llm = UnifiedLLM()
-        self.tools = tools
-        self.graph = None
-        self._stream_callback = None
-        self._build_graph()
+7. Parallel tool calls: when the question needs several INDEPENDENT tools, request them all at once
+   with lists of actions and inputs (same order):
+   {"action": ["nwac_avalanche_forecast", "noaa_area_forecast_discussion"], "input": [{}, {}]}"""
 
-    def _build_graph(self):
-        """Build the LangGraph workflow"""
-        workflow = StateGraph(AgentState)
+# Decodes the leading JSON object of a tool-call reply without regex backtracking
+_TOOL_CALL_DECODER = json.JSONDecoder()
 
-        # Add nodes (we'll wrap them with callbacks in run_async)
-        workflow.add_node("agent", self._agent_node)
-        workflow.add_node("tool_use", self._tool_use_node)
-        workflow.add_node("end", self._end_node)
+# Caps concurrent LLM generations so many sessions can't swamp Ollama or OpenAI rate limits.
+# One semaphore per event loop: an asyncio.Semaphore binds to the loop it first waits on,
+# and the sync run() starts a new loop on every call (entries go away with their loop)
+_llm_semaphores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
 
-        # Add edges
-        workflow.add_edge("agent", "tool_use")
-        workflow.add_conditional_edges(
-            "tool_use",
-            self._should_continue,
-            {
-                "continue": "agent",  # After tool execution, go back to agent to process result
-                "end": "end",          # If no tool was executed, go to end
-            },
-        )
 
-        workflow.set_entry_point("agent")
-        self.graph = workflow.compile()
+def _llm_semaphore() -> asyncio.Semaphore:
+    """Get the LLM concurrency semaphore for the running event loop"""
+    loop = asyncio.get_running_loop()
+    semaphore = _llm_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _llm_semaphores[loop] = asyncio.Semaphore(AGENT_MAX_CONCURRENCY)
+    return semaphore
 
-    def _agent_node(self, state: AgentState) -> AgentState:
-        """Agent reasoning node - decides what to do next"""
-        logger.info("📊 Agent node: Reasoning...")
+# Exception types (matched by name - they live in optional provider SDKs) worth retrying
+_TRANSIENT_LLM_ERRORS = {
+    "RateLimitError", "APIConnectionError", "APITimeoutError", "InternalServerError",
+    "ConnectError", "ConnectTimeout", "ReadTimeout", "RemoteProtocolError",
+}
 
-        # Format messages for the LLM
-        messages = state["messages"]
-        
-        # Create a prompt with tools description
-        tools_description = self._format_tools()
-        system_prompt = f"""You are a helpful AI assistant with expertise in weather and mountain forecasting. You can access specialized tools for Stevens Pass weather analysis, or provide general information and conversation.
+# Process-wide TTL cache for deterministic forecast tools: (tool, input) -> (stored_at, result)
+_tool_result_cache: dict[tuple[str, str | bytes], tuple[float, str]] = {}
+_TOOL_CACHE_MAX_ENTRIES = 64
+
+# Tools report failures as strings starting with one of these
+_TOOL_ERROR_PREFIXES = ("Error", "⚠️", "❌")
+
+# Size of the summary kept on each ToolMessage for later turns
+_TOOL_SUMMARY_LINES = 4
+_TOOL_SUMMARY_CHARS = 300
+
+# Words used to match older (cold) messages against the current question
+_KEYWORD_RE = re.compile(r"[a-z0-9']{4,}")
+_COLD_SNIPPET_CHARS = 300
+
+# System prompt is constant per tool set - built once per agent so every turn
+# sends a byte-identical prefix (keeps provider-side prompt caching effective)
+_SYSTEM_PROMPT_TEMPLATE = """You are a helpful AI assistant with expertise in weather and mountain forecasting. You can access specialized tools for Stevens Pass weather analysis, or provide general information and conversation.
 
 You have access to the following tools when needed:
 
@@ -100,25 +126,287 @@ CRITICAL TOOL USAGE RULES:
 
 6. Be helpful, conversational, and informative."""
 
+
+def _is_transient_llm_error(error: Exception) -> bool:
+    """Check if an LLM error is worth retrying (rate limit, timeout, connection, 5xx)"""
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    if type(error).__name__ in _TRANSIENT_LLM_ERRORS:
+        return True
+    status_code = getattr(error, "status_code", None)
+    return status_code == 429 or (isinstance(status_code, int) and status_code >= 500)
+
+
+def _decode_tool_call(text: str):
+    """Decode the JSON object at the start of a tool-call reply
+    
+    Fast path: the reply is exactly the object (the usual case, since generation
+    stops when the object closes). Otherwise raw_decode ignores trailing text.
+    Raises json.JSONDecodeError if there is no leading JSON object.
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass
+    tool_call, _ = _TOOL_CALL_DECODER.raw_decode(text)
+    return tool_call
+
+
+def _cache_key_for(tool_input) -> str | bytes:
+    """Canonical (sorted-key) encoding of tool input for the result cache"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(tool_input, option=orjson.OPT_SORT_KEYS, default=str)
+    return json.dumps(tool_input, sort_keys=True, default=str)
+
+
+def _summarize_tool_result(result: str) -> str:
+    """Compact extractive summary of a tool result for use in later turns
+    
+    Keeps the first few meaningful lines (headings, key figures) - tool output
+    is already structured with the most important information up front.
+    """
+    lines = []
+    for line in result.splitlines():
+        line = line.strip()
+        # Skip blank lines and ===/--- separators
+        if not line or not line.strip("=-─═ "):
+            continue
+        lines.append(line)
+        if len(lines) == _TOOL_SUMMARY_LINES:
+            break
+    summary = " | ".join(lines)
+    if len(summary) > _TOOL_SUMMARY_CHARS:
+        summary = summary[:_TOOL_SUMMARY_CHARS] + "..."
+    return summary
+
+
+class _JsonObjectTracker:
+    """Tracks brace depth across streamed chunks to spot where a leading JSON object ends"""
+
+    __slots__ = ("depth", "in_string", "escaped")
+
+    def __init__(self):
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+
+    def feed(self, text: str) -> bool:
+        """Consume a chunk; returns True once the outermost object has been closed"""
+        for ch in text:
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif ch == '\\':
+                    self.escaped = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '"':
+                self.in_string = True
+            elif ch == '{':
+                self.depth += 1
+            elif ch == '}':
+                self.depth -= 1
+                if self.depth == 0:
+                    return True
+        return False
+
+
+class AgentState(TypedDict):
+    """State definition for the agent"""
+    messages: list[BaseMessage]
+    current_tool: str | list[str] | None  # A list when the LLM requested parallel tool calls
+    tool_input: dict | list[dict] | None
+    tool_call_id: str | None
+    last_ai_idx: int | None  # Index of the newest AIMessage added this run, for O(1) lookup
+    last_tool_idx: int | None  # Index of the newest ToolMessage added this run
+    turn_start_idx: int  # Index of the first message belonging to this run's turn
+
+
+def _agent_for(config: RunnableConfig) -> "LocalGPUAgent":
+    """Resolve the agent instance a shared graph run belongs to"""
+    return config["configurable"]["agent"]
+
+
+async def _agent_step(state: AgentState, config: RunnableConfig) -> AgentState:
+    return await _agent_for(config)._agent_node(state)
+
+
+async def _tool_use_step(state: AgentState, config: RunnableConfig) -> AgentState:
+    return await _agent_for(config)._tool_use_node(state)
+
+
+def _end_step(state: AgentState, config: RunnableConfig) -> AgentState:
+    return _agent_for(config)._end_node(state)
+
+
+class LocalGPUAgent:
+    """Agentic workflow using LangGraph with unified LLM"""
+
+    # Compiled graphs and checkpointer are shared by every agent in the process
+    _compiled_graph = None
+    _persistent_graph = None
+    _checkpointer = None
+
+    def __init__(self):
+        self.llm = get_shared_llm()
+        self.tools = tools
+        # Tools are fixed after construction - index them once for O(1) lookups
+        self._tool_names = frozenset(tool.name for tool in self.tools)
+        self._tool_funcs = {tool.name: tool.func for tool in self.tools}
+        self._tool_coroutines = {tool.name: tool.coroutine for tool in self.tools if getattr(tool, "coroutine", None)}
+        # Presentational tools already return a finished, user-ready answer
+        self._presentational_tools = frozenset(
+            tool.name for tool in self.tools if (tool.metadata or {}).get("presentational")
+        )
+        self._cacheable_tools = frozenset(
+            tool.name for tool in self.tools if (tool.metadata or {}).get("cacheable")
+        )
+        self._trace = AGENT_TRACE  # Dev-only full prompt/response dumps
+        self._tool_call_counter = itertools.count(1)
+        self._tools_description = self._format_tools()
+        self._system_prompt = _SYSTEM_PROMPT_TEMPLATE.format(tools_description=self._tools_description)
+        if AGENT_PARALLEL_TOOLS:
+            self._system_prompt += _PARALLEL_TOOLS_RULE
+        self.graph = self._get_compiled_graph()
+
+    @classmethod
+    def _get_compiled_graph(cls, persistent: bool = False):
+        """Get the process-wide compiled LangGraph workflow
+        
+        The graph is identical for every agent, so it is compiled once and shared;
+        nodes find the agent to run in config["configurable"]["agent"]. The persistent
+        variant checkpoints state per thread_id so a conversation can continue from
+        its stored messages instead of rebuilding them from chat history. run_async
+        compacts each thread to one checkpoint after every turn (see _compact_thread).
+        """
+        if persistent:
+            if cls._persistent_graph is None:
+                cls._checkpointer = MemorySaver()
+                cls._persistent_graph = cls._build_workflow().compile(checkpointer=cls._checkpointer)
+            return cls._persistent_graph
+        if cls._compiled_graph is None:
+            cls._compiled_graph = cls._build_workflow().compile()
+        return cls._compiled_graph
+
+    @classmethod
+    def _build_workflow(cls) -> StateGraph:
+        """Build the LangGraph workflow"""
+        workflow = StateGraph(AgentState)
+
+        # Nodes dispatch to the agent passed in the run config
+        workflow.add_node("agent", _agent_step)
+        workflow.add_node("tool_use", _tool_use_step)
+        workflow.add_node("end", _end_step)
+
+        # Add edges
+        workflow.add_edge("agent", "tool_use")
+        workflow.add_conditional_edges(
+            "tool_use",
+            cls._should_continue,
+            {
+                "continue": "agent",  # After tool execution, go back to agent to process result
+                "end": "end",          # If no tool was executed, go to end
+            },
+        )
+
+        workflow.set_entry_point("agent")
+        return workflow
+
+    async def get_thread_state(self, thread_id: str) -> dict | None:
+        """Get the checkpointed state of a conversation thread after its latest turn
+        
+        State is kept per conversation, so it stays correct when one agent serves
+        several chat sessions.
+        """
+        graph = self._get_compiled_graph(persistent=True)
+        snapshot = await graph.aget_state({"configurable": {"thread_id": thread_id}})
+        return snapshot.values if snapshot and snapshot.values else None
+
+    def forget_thread(self, thread_id: str) -> None:
+        """Drop checkpointed state for a conversation thread (e.g. when the chat ends)"""
+        checkpointer = type(self)._checkpointer
+        if checkpointer is not None and hasattr(checkpointer, "delete_thread"):
+            checkpointer.delete_thread(thread_id)
+
+    async def _compact_thread(self, graph, config: dict, result: dict) -> None:
+        """Replace a thread's checkpoints with a single one holding the trimmed final state
+        
+        MemorySaver keeps a checkpoint per super-step, each with the full message list,
+        so without this a thread's memory grows with the square of its length. Only the
+        last AGENT_CHECKPOINT_MAX_MESSAGES messages are kept, cut at a user message and
+        never into the current turn.
+        """
+        checkpointer = type(self)._checkpointer
+        if checkpointer is None or not hasattr(checkpointer, "delete_thread"):
+            return
+        
+        messages = result["messages"]
+        turn_start = result.get("turn_start_idx", 0)
+        cut = min(max(0, len(messages) - AGENT_CHECKPOINT_MAX_MESSAGES), turn_start)
+        # Start the kept history on a user message (turn_start always is one)
+        while cut < turn_start and not isinstance(messages[cut], HumanMessage):
+            cut += 1
+        
+        def shift(idx: int | None) -> int | None:
+            return None if idx is None else idx - cut
+        
+        values = dict(result)
+        values.update(
+            messages=messages[cut:],
+            turn_start_idx=turn_start - cut,
+            last_ai_idx=shift(result.get("last_ai_idx")),
+            last_tool_idx=shift(result.get("last_tool_idx")),
+        )
+        checkpointer.delete_thread(config["configurable"]["thread_id"])
+        # Written as the "end" node's output, like a finished run - the next turn starts fresh
+        await graph.aupdate_state(config, values, as_node="end")
+        if cut:
+            logger.debug("Trimmed %d old messages from thread checkpoint", cut)
+
+    async def _agent_node(self, state: AgentState) -> AgentState:
+        """Agent reasoning node - decides what to do next"""
+        logger.debug("📊 Agent node: Reasoning...")
+
+        # Format messages for the LLM
+        messages = state["messages"]
+        
         # Build conversation history for prompt
-        # Only include recent conversation to avoid confusion from old tool calls
+        # Hot layer: the last N messages verbatim. Cold layer: a few older messages
+        # recalled by relevance, so long chats keep useful context without resending it all
         conversation = []
+        hot_messages = messages[-AGENT_HOT_CONTEXT_MESSAGES:]
+        cold_messages = messages[:-AGENT_HOT_CONTEXT_MESSAGES]
+        
+        recalled = self._recall_cold_context(cold_messages, hot_messages)
+        if recalled:
+            conversation.append("# Retrieved context (earlier in this conversation)\n" + "\n".join(recalled))
         
-        # Get last N messages (limit to prevent context overflow and confusion)
-        recent_messages = messages[-10:] if len(messages) > 10 else messages
+        # Tool results from earlier turns are sent as their short summary - only the
+        # current turn's results need full detail for synthesis
+        current_turn_start = next(
+            (idx for idx in range(len(hot_messages) - 1, -1, -1) if isinstance(hot_messages[idx], HumanMessage)),
+            0,
+        )
         
-        for msg in recent_messages:
+        for idx, msg in enumerate(hot_messages):
             if isinstance(msg, HumanMessage):
                 conversation.append(f"User: {msg.content}")
             elif isinstance(msg, AIMessage):
                 # Skip system/welcome messages that aren't relevant to current conversation
-                if "Connected to" not in msg.content and "Tools Available" not in msg.content:
+                if not msg.additional_kwargs.get("system_welcome"):
                     conversation.append(f"Assistant: {msg.content}")
             elif isinstance(msg, ToolMessage):
                 # Add tool results as context for the LLM to synthesize
                 tool_name = getattr(msg, 'name', 'unknown_tool')
+                summary = msg.additional_kwargs.get("summary")
+                if idx < current_turn_start and summary:
+                    conversation.append(f"[Earlier Tool Result from {tool_name}]: {summary}")
+                    continue
                 # Truncate very long tool results to keep prompt manageable
-                tool_content = msg.content[:1000] + "...[truncated]" if len(msg.content) > 1000 else msg.content
+                tool_content = msg.content
+                if len(tool_content) > 1000:
+                    tool_content = tool_content[:1000] + "...[truncated]"
                 conversation.append(f"[Tool Result from {tool_name}]: {tool_content}")
         
         conversation_text = "\n\n".join(conversation) if conversation else "User: Hello"
@@ -126,79 +414,89 @@ CRITICAL TOOL USAGE RULES:
         # Check if we just received a tool result - if so, prompt LLM to assess next steps
         if messages and isinstance(messages[-1], ToolMessage):
             additional_instruction = "\n\nThe tool has returned results above. Evaluate if you have sufficient information to answer the user's question:\n- If yes: synthesize the information and provide a clear, helpful response\n- If no: call ONE additional tool that would help complete the answer\nPrioritize efficiency - only chain tools when necessary."
-            prompt = f"{system_prompt}\n\n{conversation_text}{additional_instruction}\n\nAssistant:"
+            prompt = f"{self._system_prompt}\n\n{conversation_text}{additional_instruction}\n\nAssistant:"
         else:
-            prompt = f"{system_prompt}\n\n{conversation_text}\n\nAssistant:"
+            prompt = f"{self._system_prompt}\n\n{conversation_text}\n\nAssistant:"
         
-        # DEBUG: Log the prompt being sent to LLM
-        logger.debug(f"📝 PROMPT SENT TO LLM:\n{prompt[:500]}...")
+        # DEBUG: Log the prompt being sent to LLM (compiled out under python -O)
+        if self._trace:
+            logger.info("📝 PROMPT SENT TO LLM:\n%s", prompt)
+        elif __debug__ and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("📝 PROMPT SENT TO LLM:\n%s...", prompt[:500])
         
         response_chunks = []
-        is_tool_call = False
-        
-        for chunk in self.llm.generate_stream(prompt):
-            response_chunks.append(chunk)
-            
-            # Check if this is a tool call by looking at accumulated text
-            accumulated = "".join(response_chunks).strip()
-            
-            # Detect tool call early (within first few characters)
-            if len(accumulated) > 0 and not is_tool_call:
-                if accumulated[0] == '{':
-                    is_tool_call = True
-                    logger.debug("🔧 Detected tool call - stopping stream to user")
-            
-            # Stream to callback if provided and this is NOT a tool call
-            # Use instance variable self._stream_callback
-            if hasattr(self, '_stream_callback') and self._stream_callback and not is_tool_call:
-                try:
-                    # Call the callback - it handles async internally (creates tasks)
-                    self._stream_callback(chunk)
-                except Exception as e:
-                    logger.error(f"Stream callback error: {e}")
-        
+        is_tool_call = None  # Unknown until the first non-whitespace character arrives
+        pending_chunks = []  # Leading whitespace held back until we know what kind of turn this is
+        json_tracker = _JsonObjectTracker()
+
+        async with aclosing(self._stream_llm(prompt)) as stream:
+            async for chunk in stream:
+                response_chunks.append(chunk)
+
+                # Decide tool call vs. answer from the first non-whitespace character only,
+                # instead of re-joining the whole response on every chunk
+                if is_tool_call is None:
+                    stripped_chunk = chunk.lstrip()
+                    if not stripped_chunk:
+                        pending_chunks.append(chunk)
+                        continue
+                    is_tool_call = stripped_chunk[0] == '{'
+                    if is_tool_call:
+                        logger.debug("🔧 Detected tool call - stopping stream to user")
+                    else:
+                        chunk = "".join(pending_chunks) + chunk
+                        pending_chunks = []
+
+                if is_tool_call:
+                    # Stop decoding as soon as the tool-call object closes - anything the model
+                    # adds afterwards is discarded anyway. Leaving the stream closes the
+                    # connection, which cancels generation on the server.
+                    if json_tracker.feed(chunk) and self._is_complete_tool_call(response_chunks):
+                        logger.debug("🔧 Tool call JSON complete - cancelling remaining generation")
+                        break
+                    continue
+
+                # Forward each answer token to the UI as soon as it arrives
+                await self._emit_stream(chunk)
+
         response = "".join(response_chunks)
         
-        # DEBUG: Log full response for inspection
-        logger.info(f"💭 LLM Response (full): {response}")
-        logger.info(f"💭 Response length: {len(response)} chars")
-        logger.info(f"💭 Response starts with {{: {response.strip().startswith('{')}")
-        logger.info(f"💭 Response first 200 chars: {response[:200]}...")
+        if self._trace:
+            logger.info("💭 LLM Response (full): %s", response)
+        else:
+            logger.debug("💭 LLM response: %d chars, tool call: %s", len(response), bool(is_tool_call))
 
         # Check if response is a tool call (starts with {)
         current_tool = None
         tool_input = None
         tool_call_id = None
         
-        try:
-            response_stripped = response.strip()
-            logger.debug(f"🔍 Checking for tool call, stripped response: {response_stripped[:100]}...")
-            
-            if response_stripped.startswith('{'):
-                logger.info("✅ Response starts with {{, attempting JSON parse...")
-                # Try to extract JSON
-                import re
-                json_match = re.search(r'\{.*\}', response_stripped, re.DOTALL)
-                if json_match:
-                    logger.debug(f"📦 JSON match found: {json_match.group()[:100]}...")
-                    tool_call = json.loads(json_match.group())
-                    action = tool_call.get("action")
-                    logger.debug(f"🎯 Extracted action: {action}")
-                    
-                    # Only treat as tool call if action is a real tool (not "response")
-                    if action and action != "response" and get_tool_by_name(action):
-                        current_tool = action
-                        tool_input = tool_call.get("input", {})
-                        tool_call_id = str(uuid.uuid4())  # Generate unique tool call ID
-                        logger.info(f"🔧 Detected tool call: {action} (ID: {tool_call_id})")
-                    else:
-                        logger.info(f"❌ Action '{action}' is not a valid tool or is 'response'")
+        if is_tool_call:
+            # The reply starts with '{' - decode just the leading JSON object in one pass.
+            # raw_decode ignores any trailing chatter the model adds after the object.
+            response_stripped = response.lstrip()
+            try:
+                tool_call = _decode_tool_call(response_stripped)
+                action = tool_call.get("action") if isinstance(tool_call, dict) else None
+                
+                # Only treat as tool call if action is a real tool (not "response")
+                if isinstance(action, list) and self._is_known_action(action):
+                    # Parallel call: one input per action, defaulting to no parameters
+                    inputs = tool_call.get("input")
+                    if not isinstance(inputs, list) or len(inputs) != len(action):
+                        inputs = [{} for _ in action]
+                    current_tool = action
+                    tool_input = inputs
+                    logger.info("🔧 Detected parallel tool call: %s", action)
+                elif self._is_known_action(action):
+                    current_tool = action
+                    tool_input = tool_call.get("input", {})
+                    tool_call_id = self._next_tool_call_id()
+                    logger.info("🔧 Detected tool call: %s (ID: %s)", action, tool_call_id)
                 else:
-                    logger.warning(f"⚠️ Response starts with {{ but no JSON match found in: {response_stripped[:200]}...")
-            else:
-                logger.debug(f"❌ Response does NOT start with {{, first char is: '{response_stripped[0] if response_stripped else 'EMPTY'}'")
-        except (json.JSONDecodeError, AttributeError) as e:
-            logger.error(f"❌ JSON parse error: {e}. Response was: {response_stripped[:200]}...")
+                    logger.debug("❌ Action %r is not a valid tool or is 'response'", action)
+            except json.JSONDecodeError as e:
+                logger.error("❌ JSON parse error: %s. Response was: %s...", e, response_stripped[:200])
 
         # If this is a tool call, don't add the JSON to messages
         # The tool result will be added later
@@ -216,9 +514,173 @@ CRITICAL TOOL USAGE RULES:
             "current_tool": None,
             "tool_input": None,
             "tool_call_id": None,
+            "last_ai_idx": len(messages),
+        }
+
+    async def _stream_llm(self, prompt: str):
+        """Stream LLM tokens under the process-wide concurrency limit
+        
+        Transient failures (rate limits, dropped connections) before the first token
+        are retried with exponential backoff. Once tokens have been yielded the error
+        is raised instead, since they may already be on the user's screen.
+        """
+        async with _llm_semaphore():
+            for attempt in range(AGENT_LLM_MAX_RETRIES + 1):
+                started = False
+                try:
+                    async with aclosing(self.llm.generate_stream_async(prompt)) as stream:
+                        async for chunk in stream:
+                            started = True
+                            yield chunk
+                    return
+                except Exception as e:
+                    if started or attempt == AGENT_LLM_MAX_RETRIES or not _is_transient_llm_error(e):
+                        raise
+                    delay = 2 ** attempt
+                    logger.warning(
+                        "⚠️ LLM call failed (%s: %s) - retrying in %ds (attempt %d/%d)",
+                        type(e).__name__, e, delay, attempt + 1, AGENT_LLM_MAX_RETRIES
+                    )
+                    await asyncio.sleep(delay)
+
+    async def _emit_stream(self, text: str) -> None:
+        """Forward text to the stream callback (sync or async), if one is set"""
+        stream_callback = _stream_callback_var.get()
+        if not stream_callback:
+            return
+        try:
+            callback_result = stream_callback(text)
+            if inspect.isawaitable(callback_result):
+                await callback_result
+        except Exception as e:
+            logger.error("Stream callback error: %s", e)
+
+    def _next_tool_call_id(self) -> str:
+        """Cheap per-process tool call ID - only needs to correlate a call with its result"""
+        return f"tc_{os.getpid():x}_{next(self._tool_call_counter):x}"
+
+    def _is_complete_tool_call(self, response_chunks: list[str]) -> bool:
+        """Check if the streamed chunks hold a complete JSON call to a known tool"""
+        try:
+            tool_call = _decode_tool_call("".join(response_chunks).lstrip())
+        except json.JSONDecodeError:
+            return False
+        return isinstance(tool_call, dict) and self._is_known_action(tool_call.get("action"))
+
+    def _is_known_action(self, action) -> bool:
+        """Check a tool-call action: a tool name, or a list of names when parallel calls are enabled"""
+        if isinstance(action, str):
+            return action in self._tool_names
+        if AGENT_PARALLEL_TOOLS and isinstance(action, list) and action:
+            return all(isinstance(name, str) and name in self._tool_names for name in action)
+        return False
+
+    def _recall_cold_context(self, cold_messages: list[BaseMessage], hot_messages: list[BaseMessage]) -> list[str]:
+        """Return up to AGENT_COLD_RECALL_LIMIT older messages relevant to the latest question
+        
+        Relevance is keyword overlap with the most recent user message. Results are kept
+        in chronological order and truncated so the retrieved block stays small.
+        """
+        if not cold_messages or AGENT_COLD_RECALL_LIMIT <= 0:
+            return []
+        
+        query = next((msg.content for msg in reversed(hot_messages) if isinstance(msg, HumanMessage)), "")
+        query_words = set(_KEYWORD_RE.findall(query.lower()))
+        if not query_words:
+            return []
+        
+        scored = []
+        for idx, msg in enumerate(cold_messages):
+            if isinstance(msg, HumanMessage):
+                role = "User"
+            elif isinstance(msg, AIMessage):
+                if msg.additional_kwargs.get("system_welcome"):
+                    continue
+                role = "Assistant"
+            else:
+                # Old tool output is stale by now - never recall it
+                continue
+            score = len(query_words.intersection(_KEYWORD_RE.findall(msg.content.lower())))
+            if score:
+                scored.append((score, idx, role, msg.content))
+        
+        top = sorted(scored, key=lambda item: (-item[0], -item[1]))[:AGENT_COLD_RECALL_LIMIT]
+        recalled = []
+        for _, _, role, content in sorted(top, key=lambda item: item[1]):
+            if len(content) > _COLD_SNIPPET_CHARS:
+                content = content[:_COLD_SNIPPET_CHARS] + "..."
+            recalled.append(f"- {role}: {content}")
+        return recalled
+
+    async def _run_tool(self, tool_name: str, tool_input) -> str:
+        """Execute a tool without blocking the event loop, reusing recent cached results
+        
+        Forecast tools flagged cacheable in their metadata are served from a TTL cache
+        keyed by tool name + input - their upstream data only changes every few hours.
+        """
+        cache_key = None
+        if tool_name in self._cacheable_tools:
+            cache_key = (tool_name, _cache_key_for(tool_input))
+            cached = _tool_result_cache.get(cache_key)
+            if cached and time.monotonic() - cached[0] < AGENT_TOOL_CACHE_TTL:
+                logger.info("♻️ Using cached result for %s", tool_name)
+                return cached[1]
+        
+        coroutine = self._tool_coroutines.get(tool_name)
+        func = self._tool_funcs[tool_name]
+        if isinstance(tool_input, dict):
+            if coroutine:
+                result = await coroutine(**tool_input)
+            else:
+                # Blocking HTTP fetches run in a worker thread
+                result = await asyncio.to_thread(func, **tool_input)
+        elif coroutine:
+            result = await coroutine(tool_input)
+        else:
+            result = await asyncio.to_thread(func, tool_input)
+        
+        result_str = str(result)
+        
+        # Never cache failures
+        if cache_key and result_str and not result_str.startswith(_TOOL_ERROR_PREFIXES):
+            if len(_tool_result_cache) >= _TOOL_CACHE_MAX_ENTRIES:
+                _tool_result_cache.pop(next(iter(_tool_result_cache)))
+            _tool_result_cache[cache_key] = (time.monotonic(), result_str)
+        
+        return result_str
+
+    async def _run_parallel_tools(self, state: AgentState) -> AgentState:
+        """Run several independent tool calls concurrently, one ToolMessage per call"""
+        tool_names = state["current_tool"]
+        tool_inputs = state["tool_input"] or [{} for _ in tool_names]
+        logger.info("🔧 Using %d tools in parallel: %s", len(tool_names), tool_names)
+        
+        results = await asyncio.gather(
+            *(self._run_tool(name, tool_input or {}) for name, tool_input in zip(tool_names, tool_inputs)),
+            return_exceptions=True,
+        )
+        
+        new_messages = []
+        for name, result in zip(tool_names, results):
+            tool_call_id = self._next_tool_call_id()
+            if isinstance(result, BaseException):
+                error_msg = f"Tool execution error: {str(result)}"
+                logger.error("✗ %s: %s", name, error_msg)
+                new_messages.append(ToolMessage(content=error_msg, tool_call_id=tool_call_id, name=name))
+                continue
+            tool_message = ToolMessage(content=result, tool_call_id=tool_call_id, name=name)
+            tool_message.additional_kwargs["summary"] = _summarize_tool_result(result)
+            new_messages.append(tool_message)
+        
+        return {
+            "messages": state["messages"] + new_messages,
+            "current_tool": None,
+            "tool_input": None,
+            "tool_call_id": None,
+            "last_tool_idx": len(state["messages"]) + len(new_messages) - 1,
         }
 
-    def _tool_use_node(self, state: AgentState) -> AgentState:
+    async def _tool_use_node(self, state: AgentState) -> AgentState:
         """Tool execution node"""
         if not state["current_tool"]:
             return {
@@ -228,38 +690,31 @@ CRITICAL TOOL USAGE RULES:
                 "tool_call_id": None,
             }
 
-        logger.info(f"🔧 Using tool: {state['current_tool']}")
+        if isinstance(state["current_tool"], list):
+            return await self._run_parallel_tools(state)
+
+        logger.info("🔧 Using tool: %s", state["current_tool"])
 
-        tool = get_tool_by_name(state["current_tool"])
-        tool_call_id = state.get("tool_call_id", str(uuid.uuid4()))
+        tool_func = self._tool_funcs.get(state["current_tool"])
+        tool_call_id = state.get("tool_call_id") or self._next_tool_call_id()
         
-        if not tool:
+        if not tool_func:
             error_msg = f"Tool '{state['current_tool']}' not found"
-            logger.error(f"✗ {error_msg}")
+            logger.error("✗ %s", error_msg)
             return {
                 "messages": state["messages"] + [ToolMessage(content=error_msg, tool_call_id=tool_call_id)],
                 "current_tool": None,
                 "tool_input": None,
                 "tool_call_id": None,
+                "last_tool_idx": len(state["messages"]),
             }
 
         try:
-            # Execute tool
-            tool_input = state["tool_input"] or {}
-            if isinstance(tool_input, dict):
-                result = tool.func(**tool_input)
-            else:
-                result = tool.func(tool_input)
+            result_str = await self._run_tool(state["current_tool"], state["tool_input"] or {})
             
-            result_str = str(result)
-            
-            # Log result (truncated for display)
-            result_preview = result_str[:200] if len(result_str) > 200 else result_str
-            logger.info(f"✓ Tool result: {result_preview}...")
-            
-            # For long results (analysis, forecasts), show progress
-            if len(result_str) > 500:
-                logger.info(f"📊 Tool returned {len(result_str)} characters of analysis")
+            logger.info("✓ Tool %s returned %d characters", state["current_tool"], len(result_str))
+            if __debug__ and logger.isEnabledFor(logging.DEBUG):
+                logger.debug("✓ Tool result preview: %s...", result_str[:200])
             
             # Create ToolMessage with the tool name for tracking
             tool_message = ToolMessage(
@@ -267,38 +722,48 @@ CRITICAL TOOL USAGE RULES:
                 tool_call_id=tool_call_id,
                 name=state["current_tool"]  # Add tool name for identification
             )
+            tool_message.additional_kwargs["summary"] = _summarize_tool_result(result_str)
+            
+            # Presentational results go straight to the user - skip the extra LLM round
+            # trip that would only restate them. Ending on an AIMessage routes to "end".
+            if state["current_tool"] in self._presentational_tools and not result_str.startswith(_TOOL_ERROR_PREFIXES):
+                logger.info("📨 %s result is presentational - returning it directly", state["current_tool"])
+                await self._emit_stream(result_str)
+                return {
+                    "messages": state["messages"] + [tool_message, AIMessage(content=result_str)],
+                    "current_tool": None,
+                    "tool_input": None,
+                    "tool_call_id": None,
+                    "last_ai_idx": len(state["messages"]) + 1,
+                    "last_tool_idx": len(state["messages"]),
+                }
             
             return {
                 "messages": state["messages"] + [tool_message],
                 "current_tool": None,
                 "tool_input": None,
                 "tool_call_id": None,
+                "last_tool_idx": len(state["messages"]),
             }
         except Exception as e:
             error_msg = f"Tool execution error: {str(e)}"
-            logger.error(f"✗ {error_msg}")
+            logger.error("✗ %s", error_msg)
             return {
                 "messages": state["messages"] + [ToolMessage(content=error_msg, tool_call_id=tool_call_id)],
                 "current_tool": None,
                 "tool_input": None,
                 "tool_call_id": None,
+                "last_tool_idx": len(state["messages"]),
             }
 
     def _end_node(self, state: AgentState) -> AgentState:
         """End node - prepares final response"""
-        logger.info("✓ Agent workflow completed")
+        logger.debug("✓ Agent workflow completed")
         
-        # Extract tool results if any
         messages = state["messages"]
-        tool_results = []
-        for msg in messages:
-            if isinstance(msg, ToolMessage):
-                tool_results.append(msg.content)
-        
-        # If we have tool results, they should be included in the final response
-        if tool_results and messages:
-            # The last message should contain the tool result
-            logger.info(f"📊 Returning {len(tool_results)} tool result(s)")
+        tool_result_count = sum(1 for msg in messages if isinstance(msg, ToolMessage))
+        if tool_result_count:
+            logger.debug("📊 Returning %d tool result(s)", tool_result_count)
         
         return {
             "messages": messages,
@@ -307,7 +772,8 @@ CRITICAL TOOL USAGE RULES:
             "tool_call_id": None,
         }
 
-    def _should_continue(self, state: AgentState) -> str:
+    @staticmethod
+    def _should_continue(state: AgentState) -> str:
         """Determine if we should continue or end
         
         Returns "continue" if:
@@ -325,7 +791,7 @@ CRITICAL TOOL USAGE RULES:
         
         # If the last message is a ToolMessage, go back to agent to synthesize
         if messages and isinstance(messages[-1], ToolMessage):
-            logger.info("🔄 Tool result received - routing back to agent for synthesis")
+            logger.debug("🔄 Tool result received - routing back to agent for synthesis")
             return "continue"
         
         # Otherwise, we're done
@@ -338,77 +804,76 @@ CRITICAL TOOL USAGE RULES:
             descriptions.append(f"- {tool.name}: {tool.description}")
         return "\n".join(descriptions)
 
-    def run(self, user_input: str) -> str:
-        """Run the agent with user input"""
-        logger.info(f"🚀 Starting agent workflow with input: {user_input}")
-        
-        # Check LLM provider connection
-        if not self.llm.check_connection():
-            provider = self.llm.provider
-            if provider == "ollama":
-                return "Error: Cannot connect to Ollama. Please start Ollama with: ollama serve"
-            elif provider == "openai":
-                return "Error: Cannot connect to OpenAI API. Please check your OPENAI_API_KEY in .env"
-            else:
-                return f"Error: Cannot connect to LLM provider: {provider}"
-
-        initial_state = {
-            "messages": [HumanMessage(content=user_input)],
-            "current_tool": None,
-            "tool_input": None,
-            "tool_call_id": None,
-        }
-
-        result = self.graph.invoke(initial_state)
+    @staticmethod
+    def _extract_final_response(messages: list[BaseMessage]) -> str:
+        """Pick the reply for the user in a single reverse pass
         
-        # Extract final response - look for the last AIMessage (excluding welcome messages)
+        Prefers the last AIMessage (excluding welcome messages), then the last
+        ToolMessage, then whatever message came last.
+        """
         final_response = None
-        if result["messages"]:
-            # Traverse messages in reverse to find the last AIMessage
-            for msg in reversed(result["messages"]):
-                if isinstance(msg, AIMessage):
-                    # Skip system/welcome messages
-                    if "Connected to" not in msg.content and "Tools Available" not in msg.content:
-                        final_response = msg.content
-                        break
-            
-            # If no AIMessage found, check for ToolMessage as fallback
-            if not final_response:
-                for msg in reversed(result["messages"]):
-                    if isinstance(msg, ToolMessage):
-                        final_response = msg.content
-                        break
-            
-            # Last resort: get the last message's content
-            if not final_response and result["messages"]:
-                final_response = result["messages"][-1].content
+        tool_fallback = None
+        for msg in reversed(messages):
+            if isinstance(msg, AIMessage):
+                # Skip system/welcome messages
+                if not msg.additional_kwargs.get("system_welcome"):
+                    final_response = msg.content
+                    break
+            elif tool_fallback is None and isinstance(msg, ToolMessage):
+                tool_fallback = msg.content
         
         if not final_response:
-            final_response = "No response generated"
+            final_response = tool_fallback
+        if not final_response and messages:
+            final_response = messages[-1].content
+        return final_response or "No response generated"
+
+    @staticmethod
+    def _messages_from_history(user_input: str, chat_history: list | None) -> list[BaseMessage]:
+        """Convert chat history from OpenAI format to LangChain messages"""
+        if not chat_history:
+            # No history, just add current message
+            return [HumanMessage(content=user_input)]
         
-        logger.info(f"✓ Final response extracted: {final_response[:100]}...")
-        return final_response
+        messages = []
+        for msg in chat_history:
+            role = msg.get("role")
+            content = msg.get("content", "")
+            if role == "user":
+                messages.append(HumanMessage(content=content))
+            elif role == "assistant":
+                # Flag welcome banners once here so later passes check a dict key
+                # instead of substring-searching every assistant message
+                ai_message = AIMessage(content=content)
+                if "Connected to" in content or "Tools Available" in content:
+                    ai_message.additional_kwargs["system_welcome"] = True
+                messages.append(ai_message)
+        logger.info("📝 Loaded %d messages from chat history", len(messages))
+        return messages
 
-    async def run_async(self, user_input: str, chat_history: list = None, stream_callback=None) -> str:
+    def run(self, user_input: str) -> str:
+        """Run the agent with user input (synchronous entry point for scripts and tests)"""
+        return asyncio.run(self.run_async(user_input))
+
+    async def run_async(self, user_input: str, chat_history: list = None, stream_callback=None,
+                        thread_id: str | None = None) -> str:
         """Run the agent with user input and stream results
         
         Args:
             user_input: User's input message
             chat_history: Optional list of previous messages in OpenAI format
-            stream_callback: Optional async callback function to receive streamed tokens
+            stream_callback: Optional callback (sync or async) to receive streamed tokens
+            thread_id: Optional conversation ID - when given, state is checkpointed and the
+                next turn continues from the stored messages (chat_history is only used
+                to seed a thread that has no checkpoint yet)
             
         Returns:
             Final response text
         """
-        import asyncio
-        
-        # Store stream callback for node execution
-        self._stream_callback = stream_callback
-        
-        logger.info(f"🚀 Starting agent workflow with input: {user_input}")
+        logger.info("🚀 Starting agent workflow with input: %s", user_input)
         
         # Check LLM provider connection
-        if not self.llm.check_connection():
+        if not await self.llm.acheck_connection():
             provider = self.llm.provider
             if provider == "ollama":
                 return "Error: Cannot connect to Ollama. Please start Ollama with: ollama serve"
@@ -417,71 +882,106 @@ CRITICAL TOOL USAGE RULES:
             else:
                 return f"Error: Cannot connect to LLM provider: {provider}"
 
-        # Convert chat history from OpenAI format to LangChain messages
+        graph = self._get_compiled_graph(persistent=thread_id is not None)
+        config = {"configurable": {"agent": self}}
+        
+        # Continue a checkpointed thread: stored messages + the new user message
         messages = []
-        if chat_history:
-            for msg in chat_history:
-                role = msg.get("role")
-                content = msg.get("content", "")
-                if role == "user":
-                    messages.append(HumanMessage(content=content))
-                elif role == "assistant":
-                    messages.append(AIMessage(content=content))
-            logger.info(f"📝 Loaded {len(messages)} messages from chat history")
-        else:
-            # No history, just add current message
-            messages = [HumanMessage(content=user_input)]
+        if thread_id is not None:
+            config["configurable"]["thread_id"] = thread_id
+            snapshot = await graph.aget_state(config)
+            stored_messages = snapshot.values.get("messages") if snapshot and snapshot.values else None
+            if stored_messages:
+                messages = stored_messages + [HumanMessage(content=user_input)]
+                logger.info("📝 Resumed %d checkpointed messages for thread %s", len(stored_messages), thread_id)
+        
+        if not messages:
+            messages = self._messages_from_history(user_input, chat_history)
 
         initial_state = {
             "messages": messages,
             "current_tool": None,
             "tool_input": None,
             "tool_call_id": None,
+            "last_ai_idx": None,
+            "last_tool_idx": None,
+            # The current user message is the last one before the graph runs
+            "turn_start_idx": len(messages) - 1,
         }
 
+        # Store stream callback for node execution (scoped to this run's context)
+        callback_token = _stream_callback_var.set(stream_callback)
         try:
-            # Run the graph synchronously in a thread pool to avoid blocking the event loop
+            # Run the graph natively on the event loop
             # The streaming happens via callback during LLM generation
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(None, self.graph.invoke, initial_state)
+            result = await graph.ainvoke(initial_state, config)
+            if thread_id is not None:
+                await self._compact_thread(graph, config, result)
             
-            # Store the result state for later access (e.g., for plot generation)
-            self.last_result_state = result
-            
-            # Extract final response - look for the last AIMessage (excluding welcome messages)
-            final_response = None
-            if result["messages"]:
-                # Traverse messages in reverse to find the last AIMessage
-                for msg in reversed(result["messages"]):
-                    if isinstance(msg, AIMessage):
-                        # Skip system/welcome messages
-                        if "Connected to" not in msg.content and "Tools Available" not in msg.content:
-                            final_response = msg.content
-                            break
-                
-                # If no AIMessage found, check for ToolMessage as fallback
-                if not final_response:
-                    for msg in reversed(result["messages"]):
-                        if isinstance(msg, ToolMessage):
-                            final_response = msg.content
-                            break
-                
-                # Last resort: get the last message's content
-                if not final_response and result["messages"]:
-                    final_response = result["messages"][-1].content
-            
-            if not final_response:
-                final_response = "No response generated"
+            last_ai_idx = result.get("last_ai_idx")
+            if last_ai_idx is not None:
+                final_response = result["messages"][last_ai_idx].content or self._extract_final_response(result["messages"])
+            else:
+                final_response = self._extract_final_response(result["messages"])
             
-            logger.info(f"✓ Final response extracted: {final_response[:150]}...")
+            logger.info("✓ Final response extracted (%d chars)", len(final_response))
             return final_response
             
         except Exception as e:
-            logger.error(f"Error during agent execution: {e}", exc_info=True)
+            logger.error("Error during agent execution: %s", e, exc_info=True)
             raise
         finally:
             # Always clear stream callback to prevent leaks
-            self._stream_callback = None
+            _stream_callback_var.reset(callback_token)
+
+    async def astream(self, user_input: str, chat_history: list = None, thread_id: str | None = None):
+        """Run the agent and yield response text as it is generated
+
+        Tokens are handed over through a bounded asyncio.Queue: a briefly slow
+        consumer doesn't stall LLM generation, and a stuck one pauses it once
+        _STREAM_QUEUE_MAX tokens are waiting. If nothing was streamed (e.g. a
+        connection error message), the final response is yielded as a single chunk.
+
+        Args:
+            user_input: User's input message
+            chat_history: Optional list of previous messages in OpenAI format
+            thread_id: Optional conversation ID (see run_async)
+
+        Yields:
+            Response text chunks
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=_STREAM_QUEUE_MAX)
+        done = object()
+
+        async def produce() -> str:
+            try:
+                return await self.run_async(user_input, chat_history=chat_history,
+                                            stream_callback=queue.put, thread_id=thread_id)
+            finally:
+                # The consumer is still draining if the queue is full - wait for room
+                try:
+                    queue.put_nowait(done)
+                except asyncio.QueueFull:
+                    await queue.put(done)
+
+        run = asyncio.create_task(produce())
+
+        streamed = False
+        try:
+            while (token := await queue.get()) is not done:
+                streamed = True
+                yield token
+            # Re-raises any agent error
+            final_response = run.result()
+            if not streamed and final_response:
+                yield final_response
+        finally:
+            # Consumer went away early (e.g. user pressed stop) - don't keep generating
+            if not run.done():
+                run.cancel()
+                # Make room so the cancelled producer can post its sentinel and finish
+                while not queue.empty():
+                    queue.get_nowait()
 
 
 if __name__ == "__main__":
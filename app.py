@@ -3,18 +3,136 @@
 import chainlit as cl
 from chainlit.types import ThreadDict
 from agents.workflow import LocalGPUAgent
-from langchain_core.messages import HumanMessage, AIMessage
+import gc
 import logging
-import time
 import json
+import time
 import asyncio
+from collections import OrderedDict
+from config import REDIS_URL, AGENT_HISTORY_SEED_TURNS
 from scheduler import start_scheduler, stop_scheduler, get_scheduler
+from tools.basic_tools import _fetch_stevens_pass_detailed_data, build_precip_wind_figure, build_temperature_figure
 
 logger = logging.getLogger(__name__)
 
-# Track processed Slack events to prevent duplicates
-_processed_slack_events = set()
+# Redis shares Slack dedup state across workers and restarts; optional
+try:
+    import redis.asyncio as aioredis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+# orjson serializes the grid data for the plot cache key much faster; optional
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Track processed Slack events to prevent duplicates: event_ts -> first seen (monotonic),
+# oldest first. Slack retries within minutes, so entries expire after a TTL.
+_processed_slack_events: "OrderedDict[str, float]" = OrderedDict()
 _slack_event_lock = asyncio.Lock()
+_SLACK_EVENT_TTL = 300
+_SLACK_EVENT_MAX = 2000
+_SLACK_DEDUP_KEY_TTL = 600
+
+_redis_client = None
+
+# One agent serves every session - per-conversation state lives in the agent's
+# checkpointer (keyed by thread ID) and in cl.user_session
+_shared_agent: LocalGPUAgent | None = None
+
+# Chart name and figure builder for each Stevens Pass chart, in display order
+_CHART_BUILDERS = (
+    ("Precipitation & Wind", build_precip_wind_figure),
+    ("Temperature & Humidity", build_temperature_figure),
+)
+
+# Last rendered charts as (grid data, grid data hash, Plotly JSON per chart) - NOAA
+# updates the grid roughly hourly, so repeat chart requests usually render identical
+# data. Only the JSON is kept; the figure objects (and their arrays) are released.
+_plot_cache: tuple[dict, int, list] | None = None
+# One chart build at a time, so concurrent sessions share a build instead of stampeding
+_plot_build_lock = asyncio.Lock()
+# Whether PrerenderedPlotly matches a freshly built cl.Plotly (None until first checked)
+_prerendered_plotly_ok: bool | None = None
+
+# Streamed tokens are coalesced and sent as one websocket frame per tick
+_STREAM_FLUSH_INTERVAL = 0.04
+
+# Tools whose results come with Stevens Pass forecast charts
+_STEVENS_PASS_TOOLS = frozenset(("stevens_pass_comprehensive_weather", "stevens_pass_snow_analysis"))
+
+# Static UI configuration - built once at import instead of on every session
+_CHAT_PROFILES = [
+    cl.ChatProfile(
+        name="Default",
+        markdown_description="AI weather analyst for Stevens Pass.",
+        icon="https://api.dicebear.com/7.x/thumbs/svg?seed=Chat"
+    )
+]
+
+_STARTERS = [
+    cl.Starter(
+        label="❄️ Analyze Snow Forecast",
+        message="Analyze the snow forecast for Stevens Pass",
+        icon="",
+    ),
+    cl.Starter(
+        label="🌡️ Current Conditions",
+        message="Check the current conditions at Stevens Pass",
+        icon="",
+    ),
+    cl.Starter(
+        label="🏔️ Road Conditions",
+        message="What are the current road conditions and pass status for Stevens Pass?",
+        icon="",
+    ),
+    cl.Starter(
+        label="⛅ Forecast Discussion",
+        message="Get the NOAA Area Forecast Discussion for the Cascades",
+        icon="",
+    ),
+    cl.Starter(
+        label="📈 Weather Charts",
+        message="Show me weather charts for Stevens Pass",
+        icon="",
+    ),
+]
+
+
+def get_shared_agent() -> LocalGPUAgent:
+    """Get the process-wide agent, creating it on first use"""
+    global _shared_agent
+    if _shared_agent is None:
+        _shared_agent = LocalGPUAgent()
+    return _shared_agent
+
+
+def get_redis_client():
+    """Get the shared async Redis client, or None when REDIS_URL/redis aren't available"""
+    global _redis_client
+    if _redis_client is None and REDIS_URL and REDIS_AVAILABLE:
+        # from_url sets up a connection pool; the client itself is created lazily
+        _redis_client = aioredis.from_url(REDIS_URL)
+    return _redis_client
+
+
+async def claim_slack_event_globally(event_id: str) -> bool:
+    """
+    Claim a Slack event across all workers with SET NX EX.
+    Returns False if another worker (or an earlier run of this one) already claimed it.
+    Without Redis, or if Redis is unreachable, the local check alone decides.
+    """
+    client = get_redis_client()
+    if client is None:
+        return True
+    try:
+        return bool(await client.set(f"slack:dedup:{event_id}", "1", nx=True, ex=_SLACK_DEDUP_KEY_TTL))
+    except Exception as e:
+        logger.warning("Redis Slack dedup unavailable, using local dedup only: %s", e)
+        return True
 
 
 def is_slack_platform() -> bool:
@@ -37,18 +155,213 @@ async def is_duplicate_slack_event() -> bool:
         return False
     
     async with _slack_event_lock:
+        now = time.monotonic()
+        # Evict expired entries from the old end, then enforce the size cap (FIFO)
+        while _processed_slack_events:
+            oldest_id, seen_at = next(iter(_processed_slack_events.items()))
+            if now - seen_at < _SLACK_EVENT_TTL and len(_processed_slack_events) < _SLACK_EVENT_MAX:
+                break
+            del _processed_slack_events[oldest_id]
+        
         if event_id in _processed_slack_events:
-            logger.warning(f"Duplicate Slack event detected: {event_id}")
+            logger.warning("Duplicate Slack event detected: %s", event_id)
             return True
         
-        # Add to processed set (keep only last 1000 to prevent memory issues)
-        _processed_slack_events.add(event_id)
-        if len(_processed_slack_events) > 1000:
-            _processed_slack_events.pop()
+        _processed_slack_events[event_id] = now
+    
+    # Local miss - make sure no other worker has already taken this event
+    if not await claim_slack_event_globally(event_id):
+        logger.warning("Duplicate Slack event detected (another worker): %s", event_id)
+        return True
     
     return False
 
 
+async def stream_batched(response_message: cl.Message, tokens) -> int:
+    """
+    Stream an async iterator of tokens into a message, batching writes.
+    One stream_token call per flush tick instead of one per token cuts websocket
+    frames 10-30x on long responses; the tick is well below what a reader notices.
+    
+    Returns:
+        Number of tokens received
+    """
+    pending = []
+    done = asyncio.Event()
+    
+    async def flush():
+        if pending:
+            chunk = "".join(pending)
+            pending.clear()
+            await response_message.stream_token(chunk)
+    
+    async def flusher():
+        while not done.is_set():
+            try:
+                await asyncio.wait_for(done.wait(), _STREAM_FLUSH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            await flush()
+    
+    flush_task = asyncio.create_task(flusher())
+    count = 0
+    try:
+        async for token in tokens:
+            pending.append(token)
+            count += 1
+    finally:
+        done.set()
+        await flush_task
+    return count
+
+
+def prefetch_stevens_pass_data(user_input: str) -> None:
+    """
+    Start fetching Stevens Pass NOAA data in the background when the question is about it.
+    The fetch overlaps the LLM's prompt processing; the snow analysis tool and plot
+    generation then read it from the shared cache (or wait on the in-flight fetch).
+    """
+    if "stevens" not in user_input.lower():
+        return
+    
+    def log_failure(task: asyncio.Task):
+        if not task.cancelled() and task.exception():
+            logger.warning("Stevens Pass data prefetch failed: %s", task.exception())
+    
+    task = asyncio.create_task(asyncio.to_thread(_fetch_stevens_pass_detailed_data))
+    task.add_done_callback(log_failure)
+    # Hold a reference so the task isn't garbage collected mid-flight
+    cl.user_session.set("grid_prefetch_task", task)
+
+
+class PrerenderedPlotly(cl.Plotly):
+    """
+    cl.Plotly element built from already-serialized figure JSON (pass content=...).
+    cl.Plotly encodes its figure on construction; this skips that so cached charts
+    cost nothing to resend.
+    
+    This leans on cl.Plotly's internals (its __post_init__ and mime), so
+    _render_chart checks it against a real cl.Plotly once and build_plot_elements
+    falls back to plain cl.Plotly elements if a Chainlit upgrade breaks it.
+    """
+
+    def __post_init__(self) -> None:
+        self.mime = "application/json"
+        # Base Element setup only - the content is already the figure JSON
+        super(cl.Plotly, self).__post_init__()
+
+
+def _build_chart_element(name: str, build_figure, grid_data: dict) -> cl.Plotly:
+    """Build a chart figure and wrap it in a cl.Plotly element (worker thread)"""
+    return cl.Plotly(name=name, figure=build_figure(grid_data))
+
+
+def _render_chart(name: str, build_figure, grid_data: dict) -> str:
+    """Build a chart figure and return its Plotly JSON, encoded by cl.Plotly itself (worker thread)"""
+    global _prerendered_plotly_ok
+    element = _build_chart_element(name, build_figure, grid_data)
+    if _prerendered_plotly_ok is None:
+        _prerendered_plotly_ok = _matches_prerendered(element)
+    return element.content
+
+
+def _matches_prerendered(element: cl.Plotly) -> bool:
+    """Check that a PrerenderedPlotly built from element's JSON is the same element to Chainlit"""
+    try:
+        prerendered = PrerenderedPlotly(name=element.name, content=element.content)
+    except Exception as e:
+        logger.warning("PrerenderedPlotly unusable with this Chainlit version: %s", e)
+        return False
+    if (prerendered.type, prerendered.mime, prerendered.content) != (element.type, element.mime, element.content):
+        logger.warning("PrerenderedPlotly differs from cl.Plotly in this Chainlit version - rebuilding charts per message")
+        return False
+    return True
+
+
+def _grid_data_key(grid_data: dict) -> int:
+    """Content hash of grid data, used to tell whether cached figures are still current"""
+    if ORJSON_AVAILABLE:
+        return hash(orjson.dumps(grid_data, option=orjson.OPT_SORT_KEYS))
+    return hash(json.dumps(grid_data, sort_keys=True, default=str))
+
+
+def clear_plot_cache() -> None:
+    """Forget the cached charts (the next chart request rebuilds them)"""
+    global _plot_cache
+    _plot_cache = None
+
+
+async def get_chart_content(grid_data: dict) -> list:
+    """
+    Get the Plotly JSON of each chart for grid data, one per _CHART_BUILDERS entry
+    (None if it failed). Reused while the grid data is unchanged. Independent charts
+    are built and encoded concurrently, each in its own worker thread.
+    """
+    global _plot_cache
+    async with _plot_build_lock:
+        cached = _plot_cache
+        # Same object as last time (the NOAA data cache hands out one dict) - skip hashing
+        if cached and cached[0] is grid_data:
+            logger.debug("Grid data unchanged - reusing cached charts")
+            return cached[2]
+        
+        key = await asyncio.to_thread(_grid_data_key, grid_data)
+        if cached and cached[1] == key:
+            logger.debug("Grid data unchanged - reusing cached charts")
+            _plot_cache = (grid_data, key, cached[2])
+            return cached[2]
+        
+        results = await asyncio.gather(
+            *(
+                asyncio.to_thread(_render_chart, name, build_figure, grid_data)
+                for name, build_figure in _CHART_BUILDERS
+            ),
+            return_exceptions=True,
+        )
+        contents = []
+        for (name, _), result in zip(_CHART_BUILDERS, results):
+            if isinstance(result, Exception):
+                logger.error("Error building %s chart: %s", name, result, exc_info=result)
+                contents.append(None)
+            else:
+                contents.append(result)
+        
+        # Plotly figures hold parent/child reference cycles, so their trace data is only
+        # freed by the cyclic GC. Collect the young generations now (bounded cost, and
+        # only after a fresh build) rather than letting the figures linger.
+        gc.collect(1)
+        
+        # Only cache a complete set so a failed chart is retried next time
+        if all(content is not None for content in contents):
+            _plot_cache = (grid_data, key, contents)
+        return contents
+
+
+async def build_plot_elements(grid_data: dict) -> list:
+    """
+    Build the Plotly chart elements for Stevens Pass grid data.
+    Elements are per message, but the figure JSON behind them is rendered once.
+    """
+    contents = await get_chart_content(grid_data)
+    if _prerendered_plotly_ok is False:
+        # Cached JSON can't be wrapped safely - let cl.Plotly encode the figures itself
+        elements = await asyncio.gather(
+            *(
+                asyncio.to_thread(_build_chart_element, name, build_figure, grid_data)
+                for (name, build_figure), content in zip(_CHART_BUILDERS, contents)
+                if content is not None
+            )
+        )
+    else:
+        elements = [
+            PrerenderedPlotly(name=name, content=content)
+            for (name, _), content in zip(_CHART_BUILDERS, contents)
+            if content is not None
+        ]
+    logger.info("Created %d Plotly chart elements", len(elements))
+    return elements
+
+
 async def generate_weather_plots_if_needed(agent, response_message):
     """
     Generate and send weather plots if Stevens Pass weather tools were used.
@@ -61,59 +374,44 @@ async def generate_weather_plots_if_needed(agent, response_message):
             logger.debug("Skipping plot generation for Slack platform")
             return
         
-        # Check the agent's last result state to see if Stevens Pass tools were called
-        state = getattr(agent, 'last_result_state', None)
+        # Check this conversation's latest state to see if Stevens Pass tools were called
+        state = await agent.get_thread_state(cl.context.session.thread_id)
         if not state:
             logger.debug("No state found - skipping plot generation")
             return
         
+        # The agent records where this turn starts and where its newest tool result is,
+        # so the scan is bounded by this turn's tool messages, not the whole thread
         messages = state.get("messages", [])
-        
-        # Look for tool calls related to Stevens Pass weather
-        stevens_pass_tools = ["stevens_pass_comprehensive_weather", "stevens_pass_snow_analysis"]
-        tool_was_used = False
-        tool_name_found = None
-        
-        for msg in messages:
-            # Check ToolMessage which contains tool execution results
-            if hasattr(msg, "name"):
-                msg_name = msg.name
-                logger.debug(f"Found message with name: {msg_name}")
-                if msg_name in stevens_pass_tools:
-                    tool_was_used = True
-                    tool_name_found = msg_name
-                    break
-        
-        if not tool_was_used:
-            logger.debug(f"No Stevens Pass weather tools were used - checked {len(messages)} messages")
+        turn_start = state.get("turn_start_idx", 0)
+        last_tool_idx = state.get("last_tool_idx")
+        if last_tool_idx is None or last_tool_idx < turn_start:
+            logger.debug("No tools were used this turn - skipping plot generation")
             return
         
-        logger.info(f"✓ Detected {tool_name_found} was used - generating plots in async context")
+        # Look for tool results (ToolMessage names) from Stevens Pass weather tools, newest first
+        tool_names = (getattr(messages[idx], "name", None) for idx in range(last_tool_idx, turn_start - 1, -1))
+        tool_name_found = next((name for name in tool_names if name in _STEVENS_PASS_TOOLS), None)
+        
+        if tool_name_found is None:
+            logger.debug("No Stevens Pass weather tools were used - checked %d messages", last_tool_idx - turn_start + 1)
+            return
         
-        # Fetch the grid data and generate plots
-        from tools.basic_tools import _fetch_stevens_pass_detailed_data, generate_stevens_pass_weather_plots
+        logger.info("✓ Detected %s was used - generating plots in async context", tool_name_found)
         
-        data = _fetch_stevens_pass_detailed_data()
+        # Fetch the grid data (usually cached by the tool call or prefetch) and generate plots
+        data = await asyncio.to_thread(_fetch_stevens_pass_detailed_data)
         grid_data = data.get("grid_data")
         
         if not grid_data:
             logger.warning("No grid data available for plotting")
             return
         
-        # Generate plots
-        plot_result = generate_stevens_pass_weather_plots(grid_data)
-        
-        # Create Plotly elements in the proper async context
-        elements = []
-        if plot_result.get("figure1"):
-            logger.info("Creating Plotly element for figure1")
-            elements.append(cl.Plotly(name="Precipitation & Wind", figure=plot_result["figure1"]))
-        if plot_result.get("figure2"):
-            logger.info("Creating Plotly element for figure2")
-            elements.append(cl.Plotly(name="Temperature & Humidity", figure=plot_result["figure2"]))
+        # Figure construction and JSON encoding are CPU-bound - keep them off the event loop
+        elements = await build_plot_elements(grid_data)
         
         if elements:
-            logger.info(f"Sending {len(elements)} plot elements to Chainlit")
+            logger.info("Sending %d plot elements to Chainlit", len(elements))
             plot_msg = cl.Message(
                 content="📊 **Stevens Pass Weather Forecast Charts**",
                 elements=elements
@@ -122,20 +420,14 @@ async def generate_weather_plots_if_needed(agent, response_message):
             logger.info("✓ Weather plots sent successfully")
             
     except Exception as e:
-        logger.error(f"Error generating weather plots: {e}", exc_info=True)
+        logger.error("Error generating weather plots: %s", e, exc_info=True)
 
 
 # Configure Chainlit with persistence
 @cl.set_chat_profiles
 async def chat_profiles():
     """Define chat profiles for different conversation modes"""
-    return [
-        cl.ChatProfile(
-            name="Default",
-            markdown_description="AI weather analyst for Stevens Pass.",
-            icon="https://api.dicebear.com/7.x/thumbs/svg?seed=Chat"
-        )
-    ]
+    return _CHAT_PROFILES
 
 
 @cl.on_chat_start
@@ -146,10 +438,10 @@ async def start():
         try:
             start_scheduler()
         except Exception as e:
-            logger.error(f"Failed to start scheduler: {e}")
+            logger.error("Failed to start scheduler: %s", e)
         
-        # Initialize agent with tools
-        agent = LocalGPUAgent()
+        # Attach the shared agent (built once per process)
+        agent = get_shared_agent()
         cl.user_session.set("agent", agent)
         
         # Initialize message tracking
@@ -158,10 +450,13 @@ async def start():
         # Check if running in Slack mode
         if is_slack_platform():
             slack_user = cl.user_session.get("user")
-            logger.info(f"Slack session started for user: {slack_user}")
+            logger.info("Slack session started for user: %s", slack_user)
+        
+        # Keep the provider's health status fresh in the background (no-op if running)
+        agent.llm.ensure_health_monitor()
         
         # Check Ollama connection - but don't send messages yet to allow starters to show
-        if not agent.llm.check_connection():
+        if not await agent.llm.acheck_connection():
             # Show error if LLM provider is down
             provider = agent.llm.provider
             if provider == "ollama":
@@ -176,10 +471,10 @@ async def start():
                 ).send()
         else:
             # Don't send welcome message - let starters show instead
-            logger.info(f"Chat session started with {agent.llm.model_name} ({agent.llm.provider}) and {len(agent.tools)} tools")
+            logger.info("Chat session started with %s (%s) and %d tools", agent.llm.model_name, agent.llm.provider, len(agent.tools))
         
     except Exception as e:
-        logger.error(f"Error initializing agent: {e}")
+        logger.error("Error initializing agent: %s", e)
         await cl.Message(
             content=f"❌ Error initializing agent: {str(e)}",
             metadata={"timestamp": time.time(), "type": "error"}
@@ -189,33 +484,7 @@ async def start():
 @cl.set_starters
 async def set_starters():
     """Set starter prompts for quick access to common queries"""
-    return [
-        cl.Starter(
-            label="❄️ Analyze Snow Forecast",
-            message="Analyze the snow forecast for Stevens Pass",
-            icon="",
-        ),
-        cl.Starter(
-            label="🌡️ Current Conditions",
-            message="Check the current conditions at Stevens Pass",
-            icon="",
-        ),
-        cl.Starter(
-            label="🏔️ Road Conditions",
-            message="What are the current road conditions and pass status for Stevens Pass?",
-            icon="",
-        ),
-        cl.Starter(
-            label="⛅ Forecast Discussion",
-            message="Get the NOAA Area Forecast Discussion for the Cascades",
-            icon="",
-        ),
-        cl.Starter(
-            label="📈 Weather Charts",
-            message="Show me weather charts for Stevens Pass",
-            icon="",
-        ),
-    ]
+    return _STARTERS
 
 
 @cl.on_message
@@ -231,7 +500,7 @@ async def main(message: cl.Message):
         return
     
     try:
-        logger.info(f"User: {message.content}")
+        logger.info("User: %s", message.content)
         
         # Handle Slack-specific features
         if is_slack_platform():
@@ -243,14 +512,20 @@ async def main(message: cl.Message):
             slack_event = cl.user_session.get("slack_event")
             attached_files = message.elements
             if attached_files:
-                logger.info(f"Received {len(attached_files)} attached files from Slack")
-        
-        # Get chat history in OpenAI format
-        chat_history = cl.chat_context.to_openai()
-        logger.info(f"Chat history has {len(chat_history)} messages")
+                logger.info("Received %d attached files from Slack", len(attached_files))
+        
+        # The agent checkpoints each thread and appends to it turn by turn, so the full
+        # Chainlit history (an O(N) walk of every step) is only needed to seed the
+        # first turn of a session, e.g. a resumed chat after a restart
+        chat_history = None
+        if AGENT_HISTORY_SEED_TURNS and not cl.user_session.get("history_seeded"):
+            # Last K user/assistant turns only - older turns cost prompt tokens on every
+            # later turn for little benefit
+            chat_history = cl.chat_context.to_openai()[-2 * AGENT_HISTORY_SEED_TURNS:]
+            logger.info("Chat history has %d messages", len(chat_history))
         
         # Check LLM connection
-        if not agent.llm.check_connection():
+        if not await agent.llm.acheck_connection():
             provider = agent.llm.provider
             if provider == "ollama":
                 await cl.Message(
@@ -264,105 +539,29 @@ async def main(message: cl.Message):
                 ).send()
             return
         
+        # Overlap the NOAA fetch with the LLM run on Stevens Pass questions
+        prefetch_stevens_pass_data(message.content)
+        
         # Create a message to display the response
         response_message = cl.Message(content="")
         await response_message.send()
         
-        start_time = time.time()
+        start_time = time.monotonic()
         
-        # Create a thread-safe streaming callback
-        # We need this because the LLM runs in a thread pool but we need to call async functions
-        import threading
-        
-        loop = asyncio.get_event_loop()
-        stream_futures = []  # Track all streaming futures
-        stream_errors = []
-        context_error_logged = False  # Track if we've logged context errors
-        futures_lock = threading.Lock()  # Thread-safe access to futures list
-        
-        def stream_callback(token: str):
-            """Thread-safe callback that schedules async streaming"""
-            nonlocal context_error_logged
-            try:
-                # Schedule the coroutine and track the future
-                future = asyncio.run_coroutine_threadsafe(
-                    response_message.stream_token(token),
-                    loop
-                )
-                with futures_lock:
-                    stream_futures.append(future)
-            except Exception as e:
-                error_msg = str(e)
-                with futures_lock:
-                    stream_errors.append(error_msg)
-                # Only log context errors once to avoid spam
-                if ("context" in error_msg.lower() or "chainlit" in error_msg.lower()):
-                    if not context_error_logged:
-                        logger.warning(f"⚠️ Chainlit context not available for streaming (thread pool limitation) - will use fallback")
-                        context_error_logged = True
-                else:
-                    logger.error(f"Stream callback scheduling error: {e}")
-        
-        # Run the agent with async streaming
-        final_response = await agent.run_async(
-            message.content,
-            chat_history=chat_history,
-            stream_callback=stream_callback
+        # The agent graph runs on this event loop - tokens are awaited directly, no thread hop
+        streamed_tokens = await stream_batched(
+            response_message,
+            agent.astream(
+                message.content,
+                chat_history=chat_history,
+                thread_id=cl.context.session.thread_id
+            )
         )
+        cl.user_session.set("history_seeded", True)
+
+        logger.debug("✓ Streaming complete: %d tokens", streamed_tokens)
         
-        # Wait for all streaming to complete before proceeding
-        # Make a copy of futures list to avoid holding lock during wait
-        with futures_lock:
-            futures_to_wait = list(stream_futures)
-            errors_count = len(stream_errors)
-        
-        successful_streams = 0
-        context_errors = 0
-        if futures_to_wait:
-            logger.debug(f"Waiting for {len(futures_to_wait)} streaming operations to complete")
-            for future in futures_to_wait:
-                try:
-                    # Wait for each future with a reasonable timeout
-                    future.result(timeout=5.0)
-                    successful_streams += 1
-                except Exception as e:
-                    # Check if it's a Chainlit context error (streaming from thread pool issue)
-                    error_msg = str(e)
-                    if "context" in error_msg.lower() or "chainlit" in error_msg.lower():
-                        # This is expected when streaming from thread pool - will use fallback
-                        context_errors += 1
-                    else:
-                        logger.error(f"Stream future error: {e}")
-                        with futures_lock:
-                            stream_errors.append(str(e))
-            
-            if successful_streams > 0:
-                logger.debug(f"✓ Streaming complete: {successful_streams}/{len(futures_to_wait)} successful")
-            elif context_errors > 0:
-                logger.info(f"⚠️ Streaming failed due to Chainlit context ({context_errors} tokens) - using fallback")
-            else:
-                logger.warning(f"⚠️ Streaming failed: {len(stream_errors)} errors")
-        
-        # If streaming failed (no successful streams), set content as fallback
-        with futures_lock:
-            total_errors = len(stream_errors)
-            total_futures = len(stream_futures)
-        
-        if successful_streams == 0 and total_futures > 0:
-            # Complete streaming failure - set content as fallback
-            response_message.content = final_response
-            await response_message.update()
-        elif 0 < successful_streams < total_futures:
-            # Partial streaming success - ensure complete content is set
-            logger.info(f"Partial streaming: {successful_streams}/{total_futures} tokens displayed, updating full content")
-            response_message.content = final_response
-            await response_message.update()
-        
-        elapsed_time = time.time() - start_time
-        
-        # Check if Stevens Pass weather tools were used and generate plots
-        # This runs in the proper async Chainlit context
-        await generate_weather_plots_if_needed(agent, response_message)
+        elapsed_time = time.monotonic() - start_time
         
         # Update metadata
         response_message.metadata = {
@@ -371,12 +570,18 @@ async def main(message: cl.Message):
             "model": agent.llm.model_name,
             "response_time_seconds": round(elapsed_time, 2),
         }
-        await response_message.update()
+        
+        # Plot generation (if Stevens Pass weather tools were used) and the metadata
+        # update are independent - run them concurrently in this Chainlit context
+        await asyncio.gather(
+            generate_weather_plots_if_needed(agent, response_message),
+            response_message.update(),
+        )
         
         message_count = cl.user_session.get("message_count", 0) + 1
         cl.user_session.set("message_count", message_count)
         
-        logger.info(f"Response complete in {elapsed_time:.2f}s")
+        logger.info("Response complete in %.2fs", elapsed_time)
         
     except asyncio.TimeoutError:
         logger.error("Response processing timed out")
@@ -385,7 +590,7 @@ async def main(message: cl.Message):
             metadata={"timestamp": time.time(), "type": "error"}
         ).send()
     except Exception as e:
-        logger.error(f"Error: {e}", exc_info=True)
+        logger.error("Error: %s", e, exc_info=True)
         await cl.Message(
             content=f"❌ Error: {str(e)}",
             metadata={"timestamp": time.time(), "type": "error"}
@@ -396,7 +601,12 @@ async def main(message: cl.Message):
 async def on_chat_end():
     """Handle chat session end - optional cleanup"""
     message_count = cl.user_session.get("message_count", 0)
-    logger.info(f"Chat session ended. Total messages exchanged: {message_count}")
+    logger.info("Chat session ended. Total messages exchanged: %d", message_count)
+    
+    # Release the checkpointed conversation state held for this thread
+    agent = cl.user_session.get("agent")
+    if agent:
+        agent.forget_thread(cl.context.session.thread_id)
 
 
 @cl.on_stop
@@ -409,17 +619,17 @@ async def on_stop():
 @cl.on_chat_resume
 async def on_chat_resume(thread: ThreadDict):
     """Handle when user resumes a previous chat session"""
-    logger.info(f"User resumed chat session: {thread.get('id', 'unknown')}")
+    logger.info("User resumed chat session: %s", thread.get('id', 'unknown'))
     
-    # Reinitialize the agent
-    agent = LocalGPUAgent()
+    # Reattach the shared agent - no per-session rebuild
+    agent = get_shared_agent()
     cl.user_session.set("agent", agent)
     
     # Restore message count if available in thread metadata
     message_count = len(thread.get("steps", []))
     cl.user_session.set("message_count", message_count)
     
-    logger.info(f"Restored chat session with {message_count} messages")
+    logger.info("Restored chat session with %d messages", message_count)
 
 
 # ============================================================================
@@ -45,5 +45,44 @@ OPENAI_CONFIG = {
 MODEL_NAME = OLLAMA_MODEL_NAME if LLM_PROVIDER == "ollama" else OPENAI_MODEL_NAME
 MODEL_CONFIG = OLLAMA_CONFIG if LLM_PROVIDER == "ollama" else OPENAI_CONFIG
 
+# ============================================================================
+# AGENT CONFIGURATION
+# ============================================================================
+# Hot context: most recent messages sent verbatim on every turn (at least 1 - a
+# slice of [-0:] would send the whole history)
+AGENT_HOT_CONTEXT_MESSAGES = max(1, int(os.getenv("AGENT_HOT_CONTEXT_MESSAGES", "10")))
+# Cold context: max older messages recalled by relevance to the current question
+AGENT_COLD_RECALL_LIMIT = int(os.getenv("AGENT_COLD_RECALL_LIMIT", "3"))
+# Max LLM generations running at once across all chat sessions in this process
+AGENT_MAX_CONCURRENCY = int(os.getenv("AGENT_MAX_CONCURRENCY", "4"))
+# Retries (exponential backoff) for rate limits / dropped connections before the first token
+AGENT_LLM_MAX_RETRIES = int(os.getenv("AGENT_LLM_MAX_RETRIES", "3"))
+# Seconds to reuse results of cacheable forecast tools (0 disables the cache)
+AGENT_TOOL_CACHE_TTL = int(os.getenv("AGENT_TOOL_CACHE_TTL", "600"))
+# Let the LLM request several independent tools in one turn (run concurrently)
+AGENT_PARALLEL_TOOLS = os.getenv("AGENT_PARALLEL_TOOLS", "0") == "1"
+# User/assistant turns of Chainlit history used to seed a thread without a checkpoint (0 disables seeding)
+AGENT_HISTORY_SEED_TURNS = max(0, int(os.getenv("AGENT_HISTORY_SEED_TURNS", "8")))
+# Max messages kept in a thread's checkpoint (never fewer than the hot context);
+# older ones are dropped, so the cold recall pool is bounded too
+AGENT_CHECKPOINT_MAX_MESSAGES = max(
+    AGENT_HOT_CONTEXT_MESSAGES, int(os.getenv("AGENT_CHECKPOINT_MAX_MESSAGES", "40"))
+)
+# Dev tracing: log full prompts and LLM responses at INFO
+AGENT_TRACE = os.getenv("AGENT_TRACE", "0") == "1"
+
+# ============================================================================
+# SHARED STATE (optional)
+# ============================================================================
+# Redis URL (e.g. redis://localhost:6379/0) for state shared across workers, such as
+# Slack event dedup. Empty = per-process state only. Requires the redis package.
+REDIS_URL = os.getenv("REDIS_URL", "")
+
+# ============================================================================
+# SCHEDULER
+# ============================================================================
+# Timezone the 12am/6am/12pm/6pm snow analysis runs are scheduled in
+SCHEDULER_TIMEZONE = os.getenv("SCHEDULER_TIMEZONE", "America/Los_Angeles")
+
 # Logging
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
@@ -1,8 +1,10 @@
 """Unified LLM wrapper supporting Ollama (local) and OpenAI (cloud) providers"""
 
+import asyncio
+import functools
+import time
+from contextlib import aclosing
 import requests
-from langchain_ollama import OllamaLLM
-from langchain_openai import ChatOpenAI
 from config import (
     LLM_PROVIDER,
     OLLAMA_BASE_URL, OLLAMA_MODEL_NAME, OLLAMA_CONFIG,
@@ -12,6 +14,14 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Shared keep-alive session for Ollama REST probes (health check, model info)
+_http_session = requests.Session()
+
+# A successful connection probe is trusted for this many seconds
+_CONNECTION_OK_TTL = 30
+# Background probe interval - shorter than the TTL so a healthy provider never goes stale
+_HEALTH_CHECK_INTERVAL = 20
+
 
 class UnifiedLLM:
     """
@@ -24,9 +34,12 @@ class UnifiedLLM:
     Usage is identical regardless of provider.
     """
 
-    def __init__(self):
-        self.provider = LLM_PROVIDER
+    def __init__(self, provider: str = LLM_PROVIDER):
+        self.provider = provider
         self.llm = None
+        self._last_ok_ts = 0.0  # monotonic time of the last successful connection probe
+        self._health_task = None
+        self._openai_probe_client = None
         self._initialize_llm()
 
     @property
@@ -54,6 +67,8 @@ class UnifiedLLM:
     def _initialize_ollama(self):
         """Initialize Ollama local LLM"""
         try:
+            # Provider SDKs are imported on demand - only the configured one gets loaded
+            from langchain_ollama import OllamaLLM
             self.llm = OllamaLLM(
                 model=OLLAMA_MODEL_NAME,
                 base_url=OLLAMA_BASE_URL,
@@ -64,11 +79,11 @@ class UnifiedLLM:
                 model_kwargs={"num_ctx": OLLAMA_CONFIG["num_ctx"]},
             )
             logger.info(
-                f"✓ Initialized Ollama: {OLLAMA_MODEL_NAME} at {OLLAMA_BASE_URL} "
-                f"(ctx: {OLLAMA_CONFIG['num_ctx']})"
+                "✓ Initialized Ollama: %s at %s (ctx: %s)",
+                OLLAMA_MODEL_NAME, OLLAMA_BASE_URL, OLLAMA_CONFIG["num_ctx"]
             )
         except Exception as e:
-            logger.error(f"✗ Failed to initialize Ollama: {e}")
+            logger.error("✗ Failed to initialize Ollama: %s", e)
             raise
 
     def _initialize_openai(self):
@@ -79,89 +94,156 @@ class UnifiedLLM:
                     "OPENAI_API_KEY not set. Add it to .env file or set environment variable."
                 )
             
+            from langchain_openai import ChatOpenAI
             self.llm = ChatOpenAI(
                 model=OPENAI_MODEL_NAME,
                 api_key=OPENAI_API_KEY,
                 temperature=OPENAI_CONFIG["temperature"],
                 max_tokens=OPENAI_CONFIG["max_tokens"],
             )
-            logger.info(f"✓ Initialized OpenAI: {OPENAI_MODEL_NAME}")
+            logger.info("✓ Initialized OpenAI: %s", OPENAI_MODEL_NAME)
         except Exception as e:
-            logger.error(f"✗ Failed to initialize OpenAI: {e}")
+            logger.error("✗ Failed to initialize OpenAI: %s", e)
             raise
 
     def check_connection(self) -> bool:
-        """Check if LLM provider is accessible"""
+        """Check if LLM provider is accessible
+        
+        A successful probe is cached for _CONNECTION_OK_TTL seconds, so the per-message
+        checks don't cost an HTTP round-trip each. Failed LLM calls invalidate the
+        cache, and failures are never cached.
+        """
+        if time.monotonic() - self._last_ok_ts < _CONNECTION_OK_TTL:
+            return True
+        return self._probe_connection()
+
+    def _probe_connection(self) -> bool:
+        """Probe the provider now, recording the time of a successful probe"""
         if self.provider == "ollama":
-            return self._check_ollama_connection()
+            ok = self._check_ollama_connection()
         elif self.provider == "openai":
-            return self._check_openai_connection()
-        return False
+            ok = self._check_openai_connection()
+        else:
+            ok = False
+        
+        if ok:
+            self._last_ok_ts = time.monotonic()
+        return ok
+
+    async def acheck_connection(self) -> bool:
+        """Async check_connection(): a cached result returns immediately, a real probe
+        runs in a worker thread so a stalled provider can't block the event loop"""
+        if time.monotonic() - self._last_ok_ts < _CONNECTION_OK_TTL:
+            return True
+        return await asyncio.to_thread(self.check_connection)
+
+    def ensure_health_monitor(self) -> None:
+        """Start the background health probe on the running event loop (once per process)"""
+        if self._health_task is None or self._health_task.done():
+            self._health_task = asyncio.get_running_loop().create_task(self._health_loop())
+
+    async def _health_loop(self) -> None:
+        """Re-probe the provider every _HEALTH_CHECK_INTERVAL seconds
+        
+        Keeps the success cache warm, so user turns read a cached flag instead of
+        probing; a failed probe lets the next turn's check report the error.
+        """
+        while True:
+            await asyncio.sleep(_HEALTH_CHECK_INTERVAL)
+            try:
+                await asyncio.to_thread(self._probe_connection)
+            except Exception as e:
+                logger.warning("LLM health probe failed: %s", e)
+
+    def invalidate_connection(self) -> None:
+        """Forget the last successful probe so the next check_connection() re-probes"""
+        self._last_ok_ts = 0.0
 
     def _check_ollama_connection(self) -> bool:
         """Check if Ollama server is running"""
         try:
-            response = requests.get(f"{OLLAMA_BASE_URL}/api/tags", timeout=5)
+            response = _http_session.get(f"{OLLAMA_BASE_URL}/api/tags", timeout=5)
             return response.status_code == 200
         except requests.ConnectionError:
             logger.error(
-                f"✗ Cannot connect to Ollama at {OLLAMA_BASE_URL}. "
-                "Make sure Ollama is running: ollama serve"
+                "✗ Cannot connect to Ollama at %s. Make sure Ollama is running: ollama serve",
+                OLLAMA_BASE_URL
             )
             return False
 
     def _check_openai_connection(self) -> bool:
         """Check if OpenAI API is accessible (simple key validation)"""
         try:
-            # Try a minimal API call to validate key
-            from openai import OpenAI
-            client = OpenAI(api_key=OPENAI_API_KEY)
-            client.models.list()  # Simple validation call
+            # One client for all probes - each new client builds its own HTTP pool and TLS context
+            if self._openai_probe_client is None:
+                from openai import OpenAI
+                self._openai_probe_client = OpenAI(api_key=OPENAI_API_KEY)
+            # Retrieve just the configured model - validates key and model in one small request
+            self._openai_probe_client.models.retrieve(OPENAI_MODEL_NAME)
             return True
         except Exception as e:
-            logger.error(f"✗ Cannot connect to OpenAI API: {e}")
+            logger.error("✗ Cannot connect to OpenAI API: %s", e)
             return False
 
-    def generate(self, prompt: str) -> str:
-        """Generate text using configured LLM provider"""
+    def _prepare_input(self, prompt: str):
+        """Build provider-specific input for a raw prompt"""
         if not self.llm:
             raise RuntimeError("LLM not initialized")
         
         if self.provider == "openai":
             # OpenAI ChatModels expect messages, not raw prompt
             from langchain_core.messages import HumanMessage
-            messages = [HumanMessage(content=prompt)]
-            response = self.llm.invoke(messages)
-            return response.content
-        else:
-            # Ollama expects raw prompt
-            return self.llm.invoke(prompt)
+            return [HumanMessage(content=prompt)]
+        # Ollama expects raw prompt
+        return prompt
+
+    @staticmethod
+    def _chunk_text(chunk) -> str:
+        """Extract text from a streamed chunk (ChatOpenAI streams AIMessageChunk objects)"""
+        if isinstance(chunk, str):
+            return chunk
+        if hasattr(chunk, 'content'):
+            return chunk.content
+        return str(chunk)
+
+    def _stream(self, prompt: str):
+        """Single streaming path shared by generate() and generate_stream()"""
+        try:
+            for chunk in self.llm.stream(self._prepare_input(prompt)):
+                yield self._chunk_text(chunk)
+        except Exception:
+            self.invalidate_connection()
+            raise
+
+    def generate(self, prompt: str) -> str:
+        """Generate text using configured LLM provider
+        
+        Consumes the streaming endpoint and joins the chunks - local servers start
+        returning tokens immediately instead of buffering the full response.
+        """
+        return "".join(self._stream(prompt))
 
     def generate_stream(self, prompt: str):
         """Generate text with streaming"""
-        if not self.llm:
-            raise RuntimeError("LLM not initialized")
-        
-        if self.provider == "openai":
-            # OpenAI streaming with messages
-            from langchain_core.messages import HumanMessage
-            messages = [HumanMessage(content=prompt)]
-            for chunk in self.llm.stream(messages):
-                # ChatOpenAI streams AIMessageChunk objects
-                if hasattr(chunk, 'content'):
-                    yield chunk.content
-                else:
-                    yield str(chunk)
-        else:
-            # Ollama streaming with raw prompt
-            for chunk in self.llm.stream(prompt):
-                yield chunk
+        yield from self._stream(prompt)
+
+    async def generate_stream_async(self, prompt: str):
+        """Generate text with native async streaming (no thread pool)"""
+        # aclosing: if the caller stops early, close the HTTP stream right away so the
+        # server stops generating instead of waiting for garbage collection
+        try:
+            async with aclosing(self.llm.astream(self._prepare_input(prompt))) as stream:
+                async for chunk in stream:
+                    yield self._chunk_text(chunk)
+        except Exception:
+            self.invalidate_connection()
+            raise
 
     def get_model_info(self) -> dict:
         """Get information about the current model"""
         if self.provider == "ollama":
             try:
-                response = requests.get(
+                response = _http_session.get(
                     f"{OLLAMA_BASE_URL}/api/show",
                     json={"name": OLLAMA_MODEL_NAME},
                     timeout=10
@@ -187,3 +269,15 @@ class UnifiedLLM:
 
 # Backwards compatibility alias
 LocalGPULLM = UnifiedLLM
+
+
+@functools.lru_cache(maxsize=4)
+def get_shared_llm(provider: str = LLM_PROVIDER) -> UnifiedLLM:
+    """
+    Get the process-wide UnifiedLLM for a provider.
+    
+    Agents and tools share one instance so the underlying LangChain client,
+    its HTTP connection pool, and Ollama's loaded model are reused instead of
+    being rebuilt for every chat session.
+    """
+    return UnifiedLLM(provider)
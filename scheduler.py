@@ -2,49 +2,94 @@
 
 import asyncio
 import logging
-from datetime import datetime
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from apscheduler.triggers.cron import CronTrigger
-from slack_sdk import WebClient
-from slack_sdk.errors import SlackApiError
+from datetime import datetime, timezone
+from typing import Iterator
 import os
+from config import REDIS_URL, SCHEDULER_TIMEZONE
 
 logger = logging.getLogger(__name__)
 
+# With several app workers each running a scheduler, Redis picks one to post; optional
+try:
+    import redis.asyncio as aioredis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+# How long a claimed run slot stays taken - far longer than the workers' clock skew
+_RUN_CLAIM_TTL = 3600
+
+# How many times a rate-limited (HTTP 429) Slack post is retried after waiting out Retry-After
+_SLACK_RATE_LIMIT_RETRIES = 3
+
+# Slack message headers; the title's timestamp is filled in once per publish
+_MESSAGE_TITLE = "🔔 *Automated Snow Analysis Update{}*\n_{}_\n\n"
+_CONTINUED_HEADER = "*...continued (Part {})*\n\n"
+
+# Options shared by every scheduled post
+_POST_KW = {"unfurl_links": False, "unfurl_media": False}
+
 
 class SnowAnalysisScheduler:
     """Scheduler for automated Stevens Pass snow analysis"""
     
     def __init__(self):
-        self.scheduler = AsyncIOScheduler()
+        # apscheduler (+ its tz stack) and slack_sdk are imported only when a scheduler is built
+        from apscheduler.schedulers.asyncio import AsyncIOScheduler
+        
+        # An explicit zone keeps the run times independent of the host's local time
+        self.scheduler = AsyncIOScheduler(timezone=SCHEDULER_TIMEZONE)
+        self._job = None
         self.slack_client = None
         self.slack_channel = os.getenv("SLACK_CHANNEL_ID", "#snow-forecasts")
         self.is_running = False
+        self._redis = aioredis.from_url(REDIS_URL) if REDIS_URL and REDIS_AVAILABLE else None
         
         # Initialize Slack client if token is available
         slack_token = os.getenv("SLACK_BOT_TOKEN")
         if slack_token:
-            self.slack_client = WebClient(token=slack_token)
+            from slack_sdk.web.async_client import AsyncWebClient
+            self.slack_client = AsyncWebClient(token=slack_token)
             logger.info("✓ Slack client initialized for scheduled updates")
         else:
             logger.warning("⚠️ SLACK_BOT_TOKEN not found - scheduled Slack updates disabled")
     
+    async def claim_run(self) -> bool:
+        """
+        Claim this scheduled run across all workers (SET NX EX on the run's hour slot).
+        Every worker fires the same cron job; only the one that sets the key runs it.
+        Without Redis, or if Redis is unreachable, every scheduler runs its job.
+        """
+        if self._redis is None:
+            return True
+        slot = datetime.now(timezone.utc).strftime("%Y%m%d%H")
+        try:
+            return bool(await self._redis.set(
+                f"scheduler:snow_analysis:{slot}", os.getpid(), nx=True, ex=_RUN_CLAIM_TTL
+            ))
+        except Exception as e:
+            logger.warning("Redis run claim unavailable, running anyway: %s", e)
+            return True
+    
     async def run_snow_analysis(self):
         """Execute snow analysis and post to Slack"""
+        if not await self.claim_run():
+            logger.info("Scheduled snow analysis already claimed by another worker - skipping")
+            return
+        
         try:
             logger.info("=" * 70)
             logger.info("SCHEDULED SNOW ANALYSIS - Starting")
-            logger.info(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
             logger.info("=" * 70)
             
             # Import here to avoid circular dependency
             from tools.basic_tools import analyze_snow_forecast_for_stevens_pass
             
-            # Run the analysis
-            analysis_result = analyze_snow_forecast_for_stevens_pass()
+            # Run the analysis (~30s of blocking HTTP + LLM calls) off the event loop
+            analysis_result = await asyncio.to_thread(analyze_snow_forecast_for_stevens_pass)
             
             if not analysis_result or "Error" in analysis_result:
-                logger.error(f"Analysis failed: {analysis_result}")
+                logger.error("Analysis failed: %s", analysis_result)
                 return
             
             # Post to Slack if client is available
@@ -56,66 +101,71 @@ class SnowAnalysisScheduler:
             logger.info("✓ Scheduled snow analysis completed successfully")
             
         except Exception as e:
-            logger.error(f"Error in scheduled snow analysis: {e}", exc_info=True)
+            logger.error("Error in scheduled snow analysis: %s", e, exc_info=True)
+    
+    async def _post_message(self, text: str):
+        """
+        Post one message to the Slack channel. Sequential awaits already keep chunks in
+        order, so the only wait is the one Slack asks for when it rate limits (429).
+        """
+        from slack_sdk.errors import SlackApiError
+        
+        for attempt in range(_SLACK_RATE_LIMIT_RETRIES + 1):
+            try:
+                return await self.slack_client.chat_postMessage(
+                    channel=self.slack_channel, text=text, **_POST_KW
+                )
+            except SlackApiError as e:
+                if e.response.status_code != 429 or attempt == _SLACK_RATE_LIMIT_RETRIES:
+                    raise
+                retry_after = float(e.response.headers.get("Retry-After", "1"))
+                logger.warning("Slack rate limited - retrying in %.0fs", retry_after)
+                await asyncio.sleep(retry_after)
+    
+    def _iter_message_chunks(self, analysis: str, timestamp: str, max_length: int = 3800) -> Iterator[str]:
+        """
+        Yield the analysis as Slack-sized messages (Slack caps a message at 4000 chars),
+        splitting between sections so none is broken mid-way. Each part is joined from a
+        list once, instead of growing one string section by section.
+        """
+        title = _MESSAGE_TITLE.format("", timestamp)
+        if len(title) + len(analysis) <= max_length:
+            yield title + analysis
+            return
+        
+        buf = [_MESSAGE_TITLE.format(" (Part 1)", timestamp)]
+        buf_len = len(buf[0])
+        part_num = 1
+        
+        for section in analysis.split("\n\n"):
+            if buf_len + len(section) + 2 > max_length:
+                yield "".join(buf)
+                part_num += 1
+                buf = [_CONTINUED_HEADER.format(part_num)]
+                buf_len = len(buf[0])
+            buf.append(section)
+            buf.append("\n\n")
+            buf_len += len(section) + 2
+        
+        yield "".join(buf)
     
     async def post_to_slack(self, analysis: str):
         """Post analysis results to Slack channel"""
+        from slack_sdk.errors import SlackApiError
+        
         try:
-            # Format the message with header
             timestamp = datetime.now().strftime("%B %d, %Y at %I:%M %p")
-            message = f"🔔 *Automated Snow Analysis Update*\n_{timestamp}_\n\n{analysis}"
-            
-            # Slack has 4000 char limit per message, split if needed
-            max_length = 3800  # Leave room for header
             
-            if len(message) > max_length:
-                # Split into multiple messages
-                chunks = []
-                current_chunk = f"🔔 *Automated Snow Analysis Update (Part 1)*\n_{timestamp}_\n\n"
-                
-                # Split by sections to avoid breaking mid-section
-                sections = analysis.split("\n\n")
-                part_num = 1
-                
-                for section in sections:
-                    if len(current_chunk) + len(section) + 2 > max_length:
-                        chunks.append(current_chunk)
-                        part_num += 1
-                        current_chunk = f"*...continued (Part {part_num})*\n\n{section}\n\n"
-                    else:
-                        current_chunk += section + "\n\n"
-                
-                if current_chunk:
-                    chunks.append(current_chunk)
-                
-                # Post each chunk
-                for i, chunk in enumerate(chunks):
-                    response = self.slack_client.chat_postMessage(
-                        channel=self.slack_channel,
-                        text=chunk,
-                        unfurl_links=False,
-                        unfurl_media=False
-                    )
-                    logger.info(f"✓ Posted message chunk {i+1}/{len(chunks)} to Slack channel {self.slack_channel}")
-                    
-                    # Small delay between chunks to maintain order
-                    if i < len(chunks) - 1:
-                        await asyncio.sleep(0.5)
-            else:
-                # Single message
-                response = self.slack_client.chat_postMessage(
-                    channel=self.slack_channel,
-                    text=message,
-                    unfurl_links=False,
-                    unfurl_media=False
-                )
-                logger.info(f"✓ Posted message to Slack channel {self.slack_channel}")
+            # Each part is posted as soon as it is built
+            for part_num, chunk in enumerate(self._iter_message_chunks(analysis, timestamp), start=1):
+                await self._post_message(chunk)
+                logger.info("✓ Posted message part %d to Slack channel %s", part_num, self.slack_channel)
             
         except SlackApiError as e:
-            logger.error(f"Slack API error: {e.response['error']}")
-            logger.error(f"Details: {e}")
+            logger.error("Slack API error: %s", e.response['error'])
+            logger.error("Details: %s", e)
         except Exception as e:
-            logger.error(f"Error posting to Slack: {e}", exc_info=True)
+            logger.error("Error posting to Slack: %s", e, exc_info=True)
     
     def start(self):
         """Start the scheduler"""
@@ -123,11 +173,13 @@ class SnowAnalysisScheduler:
             logger.warning("Scheduler already running")
             return
         
+        from apscheduler.triggers.cron import CronTrigger
+        
         # Schedule job to run every 6 hours
         # Runs at: 12am, 6am, 12pm, 6pm daily
-        self.scheduler.add_job(
+        self._job = self.scheduler.add_job(
             self.run_snow_analysis,
-            trigger=CronTrigger(hour="0,6,12,18", minute=0),
+            trigger=CronTrigger(hour="0,6,12,18", minute=0, timezone=SCHEDULER_TIMEZONE),
             id="snow_analysis_6hr",
             name="Stevens Pass Snow Analysis (Every 6 hours)",
             replace_existing=True
@@ -148,22 +200,23 @@ class SnowAnalysisScheduler:
         logger.info("🕐 SCHEDULER STARTED")
         logger.info("=" * 70)
         logger.info("Snow analysis will run every 6 hours (12am, 6am, 12pm, 6pm)")
-        logger.info(f"Results will post to Slack channel: {self.slack_channel}")
-        logger.info(f"Next run: {self.scheduler.get_jobs()[0].next_run_time}")
+        logger.info("Results will post to Slack channel: %s", self.slack_channel)
+        logger.info("Next run: %s", self._job.next_run_time)
         logger.info("=" * 70)
     
     def stop(self):
         """Stop the scheduler"""
         if self.scheduler.running:
             self.scheduler.shutdown()
+            self._job = None
             self.is_running = False
             logger.info("Scheduler stopped")
     
     def get_next_run_time(self):
         """Get the next scheduled run time"""
-        jobs = self.scheduler.get_jobs()
-        if jobs:
-            return jobs[0].next_run_time
+        # add_job's Job is the instance the memory jobstore keeps updated
+        if self._job:
+            return self._job.next_run_time
         return None
 
 
@@ -0,0 +1,24 @@
+"""
+pytest configuration for the test scripts.
+
+Puts the repository root on sys.path once for the whole session, so modules under
+pytest import agents/, models/, tools/ and config without their own path setup.
+The scripts keep their sys.path lines because they are also run directly
+(uv run python tests/<script>.py), where this file is not loaded.
+
+Several scripts do their HTTP work at import time, which under pytest means during
+collection. The on-disk HTTP cache and the vcrpy cassettes (tests/http_cache.py)
+are therefore off by default under pytest, so neither is layered onto requests in
+an import-order-dependent way. Set TEST_HTTP_CACHE=1 / TEST_CASSETTES=1 to opt in.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+ROOT = str(Path(__file__).parent.parent)
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+os.environ.setdefault("TEST_HTTP_CACHE", "0")
+os.environ.setdefault("TEST_CASSETTES", "0")
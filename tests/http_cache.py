@@ -0,0 +1,65 @@
+"""
+Optional on-disk HTTP cache and recorded cassettes for the live-API test scripts.
+
+Repeated runs replay the NOAA / NWAC / Powder Poobah responses from
+tests/.http_cache.sqlite for an hour instead of hitting the network again.
+Needs the requests-cache package - without it the scripts fetch live as before.
+Set TEST_HTTP_CACHE=0 (e.g. in CI) to force live requests.
+
+use_cassette() records a script's requests to tests/cassettes/<name>.yaml on the
+first run and replays them afterwards (needs vcrpy). TEST_OFFLINE=1 replays only
+and fails on any request that was never recorded; TEST_CASSETTES=0 turns it off.
+"""
+
+import contextlib
+import os
+from pathlib import Path
+
+# Persistent HTTP cache for test runs; optional
+try:
+    import requests_cache
+    REQUESTS_CACHE_AVAILABLE = True
+except ImportError:
+    REQUESTS_CACHE_AVAILABLE = False
+
+# Record/replay HTTP cassettes; optional
+try:
+    import vcr
+    VCR_AVAILABLE = True
+except ImportError:
+    VCR_AVAILABLE = False
+
+HTTP_CACHE_PATH = Path(__file__).parent / ".http_cache"
+HTTP_CACHE_TTL = 3600
+CASSETTE_DIR = Path(__file__).parent / "cassettes"
+
+
+def install_http_cache() -> bool:
+    """
+    Patch requests so every Session (including the ones tools.basic_tools creates)
+    reads through the on-disk cache. Call before the first request is made.
+    Responses are keyed on the normalized URL (query params sorted).
+    """
+    if not REQUESTS_CACHE_AVAILABLE or os.getenv("TEST_HTTP_CACHE", "1") == "0":
+        return False
+    requests_cache.install_cache(str(HTTP_CACHE_PATH), backend="sqlite", expire_after=HTTP_CACHE_TTL)
+    print(f"(HTTP responses cached in {HTTP_CACHE_PATH}.sqlite for {HTTP_CACHE_TTL}s - TEST_HTTP_CACHE=0 to disable)")
+    return True
+
+
+def use_cassette(name: str):
+    """
+    Context manager that records the enclosed requests to tests/cassettes/<name>.yaml
+    and replays them on later runs. Requests are matched on method and full URL;
+    Authorization headers are never written to the cassette. A no-op without vcrpy
+    or with TEST_CASSETTES=0.
+    """
+    if not VCR_AVAILABLE or os.getenv("TEST_CASSETTES", "1") == "0":
+        return contextlib.nullcontext()
+    recorder = vcr.VCR(
+        cassette_library_dir=str(CASSETTE_DIR),
+        record_mode="none" if os.getenv("TEST_OFFLINE") == "1" else "new_episodes",
+        match_on=["method", "scheme", "host", "port", "path", "query"],
+        filter_headers=["authorization"],
+    )
+    return recorder.use_cassette(f"{name}.yaml")
@@ -4,7 +4,9 @@ Investigate NWAC API endpoints for avalanche forecast data.
 
 import requests
 import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 
 # Known NWAC zone for Stevens Pass
 STEVENS_PASS_ZONE = "stevens-pass"
@@ -21,54 +23,66 @@ possible_endpoints = [
     f"https://nwac.us/wp-json/wp/v2/avalanche_forecast",
 ]
 
+# One session for every probe so connections to nwac.us / api.nwac.us are kept alive
+session = requests.Session()
+session.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+})
+session.mount('https://', HTTPAdapter(pool_connections=2, pool_maxsize=len(possible_endpoints)))
+
 print("Testing NWAC API endpoints...\n")
 print("=" * 80)
 
-for endpoint in possible_endpoints:
-    try:
-        print(f"\nTrying: {endpoint}")
-        response = requests.get(endpoint, timeout=10, headers={
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
-        print(f"Status: {response.status_code}")
-        
-        if response.status_code == 200:
-            # Try to parse as JSON
-            try:
-                data = response.json()
-                print(f"✅ SUCCESS - JSON Response!")
-                print(f"Keys: {list(data.keys()) if isinstance(data, dict) else 'Array with ' + str(len(data)) + ' items'}")
-                
-                # Save successful response
-                with open('nwac_api_response.json', 'w') as f:
-                    json.dump(data, f, indent=2)
-                print(f"Saved to nwac_api_response.json")
-                
-                # Print first 500 chars
-                print(f"\nFirst 500 chars of response:")
-                print(json.dumps(data, indent=2)[:500])
-                break
-            except:
-                # Not JSON, maybe HTML
-                if 'json' in response.headers.get('Content-Type', ''):
-                    print(f"Content-Type says JSON but failed to parse")
-                else:
-                    print(f"Content-Type: {response.headers.get('Content-Type')}")
-                    print(f"Response length: {len(response.text)} chars")
-        
-        elif response.status_code == 404:
-            print("❌ Not Found")
-        elif response.status_code == 403:
-            print("❌ Forbidden (may require API key)")
-        else:
-            print(f"❌ Status {response.status_code}")
+# Probe every endpoint at once - dead URLs cost one timeout in total, not one each
+with ThreadPoolExecutor(max_workers=len(possible_endpoints)) as executor:
+    futures = {executor.submit(session.get, endpoint, timeout=10): endpoint for endpoint in possible_endpoints}
+    
+    for future in as_completed(futures):
+        endpoint = futures[future]
+        print(f"\nTried: {endpoint}")
+        try:
+            response = future.result()
+            print(f"Status: {response.status_code}")
             
-    except requests.exceptions.Timeout:
-        print("⏱️ Timeout")
-    except requests.exceptions.ConnectionError:
-        print("❌ Connection Error")
-    except Exception as e:
-        print(f"❌ Error: {e}")
+            if response.status_code == 200:
+                # Try to parse as JSON
+                try:
+                    data = response.json()
+                    print(f"✅ SUCCESS - JSON Response!")
+                    print(f"Keys: {list(data.keys()) if isinstance(data, dict) else 'Array with ' + str(len(data)) + ' items'}")
+                    
+                    # Save successful response
+                    with open('nwac_api_response.json', 'w') as f:
+                        json.dump(data, f, indent=2)
+                    print(f"Saved to nwac_api_response.json")
+                    
+                    # Print first 500 chars
+                    print(f"\nFirst 500 chars of response:")
+                    print(json.dumps(data, indent=2)[:500])
+                    
+                    # Found one - in-flight probes finish within their timeout but are ignored
+                    break
+                except:
+                    # Not JSON, maybe HTML
+                    if 'json' in response.headers.get('Content-Type', ''):
+                        print(f"Content-Type says JSON but failed to parse")
+                    else:
+                        print(f"Content-Type: {response.headers.get('Content-Type')}")
+                        print(f"Response length: {len(response.text)} chars")
+            
+            elif response.status_code == 404:
+                print("❌ Not Found")
+            elif response.status_code == 403:
+                print("❌ Forbidden (may require API key)")
+            else:
+                print(f"❌ Status {response.status_code}")
+                
+        except requests.exceptions.Timeout:
+            print("⏱️ Timeout")
+        except requests.exceptions.ConnectionError:
+            print("❌ Connection Error")
+        except Exception as e:
+            print(f"❌ Error: {e}")
 
 print("\n" + "=" * 80)
 print("\nAlternative: Scraping the forecast page HTML")
@@ -78,9 +92,7 @@ print("=" * 80)
 try:
     url = f"https://nwac.us/avalanche-forecast/#{STEVENS_PASS_ZONE}"
     print(f"\nFetching: {url}")
-    response = requests.get(url, timeout=10, headers={
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-    })
+    response = session.get(url, timeout=10)
     
     if response.status_code == 200:
         print(f"✅ Page loaded successfully")
@@ -101,7 +113,8 @@ try:
             print(f"\nFound {len(scripts)} script tags")
             
             for i, script in enumerate(scripts):
-                if script.string and ('forecast' in script.string.lower() or 'nwac' in script.string.lower()):
+                script_lc = script.string.lower() if script.string else ""
+                if 'forecast' in script_lc or 'nwac' in script_lc:
                     print(f"\nScript {i} contains forecast/nwac keywords")
                     print(f"First 300 chars: {script.string[:300]}")
                     
@@ -5,13 +5,19 @@ Script to fetch comprehensive Stevens Pass data and save it to JSON for inspecti
 
 import json
 import logging
+import os
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from urllib3.util.retry import Retry
 from requests.adapters import HTTPAdapter
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# The gridpoint forecast (~0.5-2 MB) is written here as-is rather than parsed into the main file
+GRID_OUTPUT_FILE = "stevens_pass_grid.json"
+
 
 def _create_session_with_retries():
     """Create a requests session with retry logic and longer timeout"""
@@ -28,6 +34,25 @@ def _create_session_with_retries():
     return session
 
 
+def _fetch_json(session, url, timeout):
+    """GET a URL and return its parsed JSON body"""
+    logger.info(f"Fetching: {url}")
+    response = session.get(url, timeout=timeout)
+    response.raise_for_status()
+    return response.json()
+
+
+def _stream_to_file(session, url, timeout, path):
+    """GET a URL and stream its body straight to a file without parsing it"""
+    logger.info(f"Streaming: {url} -> {path}")
+    with session.get(url, timeout=timeout, stream=True) as response:
+        response.raise_for_status()
+        with open(path, 'wb') as f:
+            for block in response.iter_content(chunk_size=64 * 1024):
+                f.write(block)
+    return {"saved_to": path}
+
+
 def fetch_and_save_stevens_pass_data():
     """Fetch comprehensive Stevens Pass data and save to JSON"""
     try:
@@ -53,7 +78,7 @@ def fetch_and_save_stevens_pass_data():
                 "location": location_name,
                 "latitude": latitude,
                 "longitude": longitude,
-                "timestamp": str(__import__('datetime').datetime.now().isoformat()),
+                "timestamp": datetime.now().isoformat(),
             },
             "points_response": points_data,
             "forecast_response": None,
@@ -62,30 +87,24 @@ def fetch_and_save_stevens_pass_data():
         }
         
         props = points_data.get("properties", {})
-        forecast_url = props.get("forecast")
-        forecast_grid_url = props.get("forecastGridData")
-        alerts_url = props.get("alerts")
-        
-        # Fetch forecast
-        if forecast_url:
-            logger.info(f"Fetching forecast: {forecast_url}")
-            forecast_response = session.get(forecast_url, timeout=timeout)
-            forecast_response.raise_for_status()
-            all_data["forecast_response"] = forecast_response.json()
         
-        # Fetch forecast grid data
-        if forecast_grid_url:
-            logger.info(f"Fetching forecast grid data: {forecast_grid_url}")
-            grid_response = session.get(forecast_grid_url, timeout=timeout)
-            grid_response.raise_for_status()
-            all_data["forecast_grid_response"] = grid_response.json()
-        
-        # Fetch alerts
-        if alerts_url:
-            logger.info(f"Fetching alerts: {alerts_url}")
-            alerts_response = session.get(alerts_url, timeout=timeout)
-            alerts_response.raise_for_status()
-            all_data["alerts_response"] = alerts_response.json()
+        # The forecast, grid and alerts URLs are independent - fetch them concurrently
+        tasks = {
+            "forecast_response": props.get("forecast"),
+            "forecast_grid_response": props.get("forecastGridData"),
+            "alerts_response": props.get("alerts"),
+        }
+        with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+            futures = {
+                key: executor.submit(_fetch_json, session, url, timeout)
+                for key, url in tasks.items() if url and key != "forecast_grid_response"
+            }
+            if tasks["forecast_grid_response"]:
+                futures["forecast_grid_response"] = executor.submit(
+                    _stream_to_file, session, tasks["forecast_grid_response"], timeout, GRID_OUTPUT_FILE
+                )
+            for key, future in futures.items():
+                all_data[key] = future.result()
         
         # Save to JSON file
         output_file = "stevens_pass_data.json"
@@ -109,15 +128,13 @@ def fetch_and_save_stevens_pass_data():
             periods = all_data["forecast_response"].get("properties", {}).get("periods", [])
             print(f"  ✓ Forecast ({len(periods)} periods)")
         if all_data["forecast_grid_response"]:
-            grid_props = all_data["forecast_grid_response"].get("properties", {})
-            grid_keys = [k for k in grid_props.keys() if isinstance(grid_props.get(k), dict) and "values" in grid_props.get(k, {})]
-            print(f"  ✓ Forecast Grid Data ({len(grid_keys)} parameters: {', '.join(grid_keys[:5])}...)")
+            print(f"  ✓ Forecast Grid Data (saved to {GRID_OUTPUT_FILE}, {os.path.getsize(GRID_OUTPUT_FILE) / 1024:.1f} KB)")
         if all_data["alerts_response"]:
             alerts = all_data["alerts_response"].get("features", [])
             print(f"  ✓ Alerts ({len(alerts)} active)")
         
         print(f"\nFull data saved to: {output_file}")
-        print(f"File size: {len(json.dumps(all_data)) / 1024:.1f} KB")
+        print(f"File size: {os.path.getsize(output_file) / 1024:.1f} KB")
         
     except Exception as e:
         logger.error(f"Error: {e}", exc_info=True)
@@ -6,10 +6,15 @@ from urllib3.util.retry import Retry
 from requests.adapters import HTTPAdapter
 
 session = requests.Session()
-retry_strategy = Retry(total=3, backoff_factor=1, status_forcelist=[429, 500, 502, 503, 504])
+# Short backoff ladder (0.2/0.4/0.8s); a 429/503 Retry-After from NOAA still wins
+retry_strategy = Retry(total=3, backoff_factor=0.2, status_forcelist=[429, 500, 502, 503, 504],
+                       respect_retry_after_header=True)
 adapter = HTTPAdapter(max_retries=retry_strategy)
 session.mount('https://', adapter)
 
+# A SYNOPSIS is a paragraph or two - never scan further than this for its end
+SYNOPSIS_MAX_CHARS = 4000
+
 # Fetch SEW AFD products
 afd_url = 'https://api.weather.gov/products/types/AFD/locations/SEW'
 print(f"Fetching AFD from: {afd_url}\n")
@@ -44,11 +49,12 @@ if products:
     print("\n✓ Looking for geographic coverage mentions...")
     
     # Find SYNOPSIS section
-    if '.SYNOPSIS' in afd_text:
-        synopsis_start = afd_text.find('.SYNOPSIS')
-        synopsis_end = afd_text.find('\n.', synopsis_start + 1)
+    synopsis_start = afd_text.find('.SYNOPSIS')
+    if synopsis_start != -1:
+        search_end = synopsis_start + SYNOPSIS_MAX_CHARS
+        synopsis_end = afd_text.find('\n.', synopsis_start + 1, search_end)
         if synopsis_end == -1:
-            synopsis_end = len(afd_text)
+            synopsis_end = min(search_end, len(afd_text))
         
         synopsis = afd_text[synopsis_start:synopsis_end]
         print("\n**SYNOPSIS SECTION:**")
@@ -58,7 +64,8 @@ if products:
         cascade_keywords = ["cascade", "mountain", "pass", "stevens", "snoqualmie", "snoqualme", 
                            "alpine", "terrain", "elevation", "divide"]
         
-        mentions = [kw for kw in cascade_keywords if kw.lower() in synopsis.lower()]
+        synopsis_lc = synopsis.lower()
+        mentions = [kw for kw in cascade_keywords if kw in synopsis_lc]
         if mentions:
             print(f"\n✓ Cascade Keywords Found in SYNOPSIS: {mentions}")
         else:
@@ -68,7 +75,7 @@ if products:
     print("\n" + "="*70)
     print("Looking for explicit geographic coverage...")
     
-    lines = afd_text.split('\n')[:20]  # First 20 lines
+    lines = afd_text.split('\n', 20)[:20]  # First 20 lines - don't split the rest
     print("\nFirst 20 lines of AFD:")
     for i, line in enumerate(lines, 1):
         print(f"{i}: {line}")
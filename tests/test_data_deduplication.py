@@ -4,6 +4,8 @@ Also checks that Powder Poobah content is properly extracted.
 """
 
 import sys
+import mmap
+from collections import defaultdict
 from pathlib import Path
 import re
 
@@ -12,6 +14,16 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from tools.basic_tools import get_powder_poobah_latest_forecast
 
+# Section markers checked in the saved prompt, by tag. All are found in one pass, so a
+# new check is one more entry here rather than another scan of the file.
+PROMPT_MARKERS = {
+    b"NWAC AVALANCHE FORECAST - STEVENS PASS": "nwac",
+    b"EXPERT CONTEXT: Powder Poobah": "poobah",
+}
+PROMPT_MARKERS_RE = re.compile(b"|".join(re.escape(marker) for marker in PROMPT_MARKERS))
+# Rule the analysis prompt puts between its data sections
+SECTION_BANNER = b"=" * 70
+
 print("=" * 80)
 print("Data Deduplication & Content Validation Test")
 print("=" * 80)
@@ -95,11 +107,27 @@ try:
             latest_prompt = prompt_files[0]
             print(f"Analyzing: {latest_prompt.name}")
             
-            with open(latest_prompt, 'r', encoding='utf-8') as f:
-                content = f.read()
+            # Scan the file's bytes in place (mmap) - no copy of the whole prompt as a str
+            positions = defaultdict(list)  # tag -> start offset of every occurrence
+            poobah_section = None
+            with open(latest_prompt, 'rb') as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                try:
+                    for match in PROMPT_MARKERS_RE.finditer(mm):
+                        positions[PROMPT_MARKERS[match.group()]].append(match.start())
+                    
+                    # The section runs to the next SECTION_BANNER at least 100 bytes on
+                    # (skips the header's own rule); only that slice is decoded
+                    if positions["poobah"]:
+                        poobah_start = positions["poobah"][0]
+                        poobah_end = mm.find(SECTION_BANNER, poobah_start + 100)
+                        if poobah_end > poobah_start:
+                            poobah_section = mm[poobah_start:poobah_end].decode('utf-8', errors='replace')
+                finally:
+                    mm.close()
             
             # Count NWAC sections
-            nwac_count = content.count("NWAC AVALANCHE FORECAST - STEVENS PASS")
+            nwac_count = len(positions["nwac"])
             print(f"  NWAC sections found: {nwac_count}")
             
             if nwac_count > 1:
@@ -108,24 +136,22 @@ try:
                 print(f"  ✅ NWAC not duplicated")
             
             # Check Powder Poobah content length
-            poobah_start = content.find("EXPERT CONTEXT: Powder Poobah")
-            if poobah_start >= 0:
-                poobah_end = content.find("=" * 70, poobah_start + 100)
-                if poobah_end > poobah_start:
-                    poobah_section = content[poobah_start:poobah_end]
-                    
-                    # Check if it's just empty headers
-                    lines = [l.strip() for l in poobah_section.split('\n') if l.strip()]
-                    content_lines = [l for l in lines if not l.startswith('=') and 'Post:' not in l and 'Source:' not in l and 'EXPERT CONTEXT' not in l]
-                    
-                    print(f"  Powder Poobah section length: {len(poobah_section)} chars")
-                    print(f"  Powder Poobah content lines: {len(content_lines)}")
-                    
-                    if len(content_lines) > 0:
-                        print(f"  ✅ Powder Poobah has content")
-                    else:
-                        print(f"  ⚠️  Powder Poobah section is mostly empty")
-            else:
+            if poobah_section is not None:
+                # Check if it's just empty headers
+                lines = (l.strip() for l in poobah_section.splitlines())
+                content_line_count = sum(
+                    1 for l in lines
+                    if l and not l.startswith('=') and 'Post:' not in l and 'Source:' not in l and 'EXPERT CONTEXT' not in l
+                )
+                
+                print(f"  Powder Poobah section length: {len(poobah_section)} chars")
+                print(f"  Powder Poobah content lines: {content_line_count}")
+                
+                if content_line_count > 0:
+                    print(f"  ✅ Powder Poobah has content")
+                else:
+                    print(f"  ⚠️  Powder Poobah section is mostly empty")
+            elif not positions["poobah"]:
                 print(f"  ⚠️  Powder Poobah section not found")
             
             print()
@@ -5,16 +5,19 @@ import requests
 import json
 from urllib3.util.retry import Retry
 from requests.adapters import HTTPAdapter
+from http_cache import install_http_cache, use_cassette
 
 
 def create_session_with_retries():
     """Create a requests session with retry logic and longer timeout"""
     session = requests.Session()
+    # Short backoff ladder (0.2/0.4/0.8s); a 429/503 Retry-After from NOAA still wins
     retry_strategy = Retry(
         total=3,
-        backoff_factor=1,
+        backoff_factor=0.2,
         status_forcelist=[429, 500, 502, 503, 504],
-        allowed_methods=["HEAD", "GET", "OPTIONS"]
+        allowed_methods=["HEAD", "GET", "OPTIONS"],
+        respect_retry_after_header=True
     )
     adapter = HTTPAdapter(max_retries=retry_strategy)
     session.mount("http://", adapter)
@@ -22,9 +25,38 @@ def create_session_with_retries():
     return session
 
 
+_session = None
+
+
+def get_session():
+    """
+    One keep-alive session for every api.weather.gov call in this script, so the
+    chained points -> forecast and list -> product requests reuse one connection.
+    Created on first use, after any HTTP cache is installed.
+    """
+    global _session
+    if _session is None:
+        _session = create_session_with_retries()
+    return _session
+
+
+def _print_product(product_data):
+    """Print a product response and return whether it carried productText"""
+    print(f"  Response keys: {list(product_data.keys())}")
+    
+    if "productText" in product_data:
+        product_text = product_data["productText"]
+        print(f"  ✓ Found productText! Length: {len(product_text)} chars")
+        print(f"  First 500 chars:\n{product_text[:500]}")
+        return True
+    
+    print(f"  ✗ productText not in response")
+    return False
+
+
 def test_afd_endpoints():
     """Test various NOAA AFD endpoints"""
-    session = create_session_with_retries()
+    session = get_session()
     timeout = 30
     
     endpoints = [
@@ -62,6 +94,7 @@ def test_afd_endpoints():
                     product_api_url = first_item.get('@id')
                     
                     print(f"\nTrying to fetch full product details...")
+                    fetched = False
                     
                     # Try using the @id URL
                     if product_api_url:
@@ -69,37 +102,19 @@ def test_afd_endpoints():
                             print(f"  Fetching from @id: {product_api_url}")
                             product_response = session.get(product_api_url, timeout=timeout)
                             product_response.raise_for_status()
-                            product_data = product_response.json()
-                            
-                            print(f"  Response keys: {list(product_data.keys())}")
-                            
-                            if "productText" in product_data:
-                                product_text = product_data["productText"]
-                                print(f"  ✓ Found productText! Length: {len(product_text)} chars")
-                                print(f"  First 500 chars:\n{product_text[:500]}")
-                            else:
-                                print(f"  ✗ productText not in response")
-                                print(f"  Available keys: {list(product_data.keys())}")
+                            fetched = _print_product(product_response.json())
                         except Exception as e:
                             print(f"  Error fetching from @id: {e}")
                     
-                    # Try constructing URL from product_id
-                    if product_id:
+                    # Fall back to constructing the URL from product_id (same product -
+                    # only needed when the @id fetch failed)
+                    if product_id and not fetched:
                         try:
                             constructed_url = f"https://api.weather.gov/products/{product_id}"
                             print(f"\n  Trying constructed URL: {constructed_url}")
                             product_response = session.get(constructed_url, timeout=timeout)
                             product_response.raise_for_status()
-                            product_data = product_response.json()
-                            
-                            print(f"  Response keys: {list(product_data.keys())}")
-                            
-                            if "productText" in product_data:
-                                product_text = product_data["productText"]
-                                print(f"  ✓ Found productText! Length: {len(product_text)} chars")
-                                print(f"  First 500 chars:\n{product_text[:500]}")
-                            else:
-                                print(f"  ✗ productText not in response")
+                            _print_product(product_response.json())
                         except Exception as e:
                             print(f"  Error with constructed URL: {e}")
         
@@ -111,7 +126,7 @@ def test_afd_endpoints():
 
 def test_stevens_pass_weather():
     """Test Stevens Pass weather endpoint"""
-    session = create_session_with_retries()
+    session = get_session()
     timeout = 30
     
     print(f"\n{'='*80}")
@@ -162,11 +177,14 @@ def test_stevens_pass_weather():
 
 
 if __name__ == "__main__":
+    install_http_cache()
     print("NOAA API Response Inspector")
     print("="*80)
     
-    test_afd_endpoints()
-    test_stevens_pass_weather()
+    with use_cassette("noaa_afd"):
+        test_afd_endpoints()
+    with use_cassette("noaa_stevens_pass_weather"):
+        test_stevens_pass_weather()
     
     print(f"\n{'='*80}")
     print("Test complete!")
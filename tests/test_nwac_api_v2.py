@@ -4,6 +4,9 @@ Test the NWAC API v1 endpoint found in the page source.
 
 import requests
 import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from http_cache import install_http_cache, use_cassette
 
 # Base API URL from page source
 BASE_API_URL = "https://nwac.us/api/v1/"
@@ -20,6 +23,10 @@ endpoints_to_test = [
     "zones",
 ]
 
+# Only when run directly - pytest imports this file while collecting
+if __name__ == "__main__":
+    install_http_cache()
+
 print("Testing NWAC API v1 endpoints...")
 print("=" * 80)
 
@@ -28,63 +35,76 @@ headers = {
     'Accept': 'application/json',
 }
 
-for endpoint in endpoints_to_test:
-    url = BASE_API_URL + endpoint
-    try:
-        print(f"\n🔍 Trying: {url}")
-        response = requests.get(url, timeout=10, headers=headers)
-        print(f"   Status: {response.status_code}")
-        
-        if response.status_code == 200:
-            try:
-                data = response.json()
-                print(f"   ✅ SUCCESS - JSON Response!")
-                
-                # Display structure
-                if isinstance(data, dict):
-                    print(f"   Type: Dictionary")
-                    print(f"   Keys: {list(data.keys())[:10]}")
-                elif isinstance(data, list):
-                    print(f"   Type: Array with {len(data)} items")
-                    if len(data) > 0:
-                        print(f"   First item keys: {list(data[0].keys()) if isinstance(data[0], dict) else 'N/A'}")
-                
-                # Save the response
-                filename = f"nwac_api_{endpoint.replace('/', '_')}.json"
-                with open(filename, 'w') as f:
-                    json.dump(data, f, indent=2)
-                print(f"   💾 Saved to {filename}")
-                
-                # Show preview
-                preview = json.dumps(data, indent=2)[:800]
-                print(f"\n   Preview (first 800 chars):")
-                print("   " + "-" * 76)
-                for line in preview.split('\n'):
-                    print(f"   {line}")
-                print("   " + "-" * 76)
-                
-                # If this is the forecast endpoint, we're done!
-                if 'danger' in preview.lower() or 'avalanche' in preview.lower():
-                    print(f"\n   🎯 This looks like the forecast data we need!")
-                    break
+# One pooled session so all probes can be in flight at once
+session = requests.Session()
+session.headers.update(headers)
+session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=len(endpoints_to_test)))
+
+# Probe every endpoint at once - dead URLs cost one timeout in total, not one each
+with use_cassette("nwac_api_v1_probes"), ThreadPoolExecutor(max_workers=len(endpoints_to_test)) as executor:
+    futures = {
+        executor.submit(session.get, BASE_API_URL + endpoint, timeout=10): endpoint
+        for endpoint in endpoints_to_test
+    }
+    
+    for future in as_completed(futures):
+        endpoint = futures[future]
+        url = BASE_API_URL + endpoint
+        try:
+            print(f"\n🔍 Tried: {url}")
+            response = future.result()
+            print(f"   Status: {response.status_code}")
+            
+            if response.status_code == 200:
+                try:
+                    data = response.json()
+                    print(f"   ✅ SUCCESS - JSON Response!")
+                    
+                    # Display structure
+                    if isinstance(data, dict):
+                        print(f"   Type: Dictionary")
+                        print(f"   Keys: {list(data.keys())[:10]}")
+                    elif isinstance(data, list):
+                        print(f"   Type: Array with {len(data)} items")
+                        if len(data) > 0:
+                            print(f"   First item keys: {list(data[0].keys()) if isinstance(data[0], dict) else 'N/A'}")
                     
-            except json.JSONDecodeError:
-                print(f"   ⚠️ Response not JSON")
-                print(f"   Content-Type: {response.headers.get('Content-Type')}")
+                    # Save the response
+                    filename = f"nwac_api_{endpoint.replace('/', '_')}.json"
+                    with open(filename, 'w') as f:
+                        json.dump(data, f, indent=2)
+                    print(f"   💾 Saved to {filename}")
+                    
+                    # Show preview
+                    preview = json.dumps(data, indent=2)[:800]
+                    print(f"\n   Preview (first 800 chars):")
+                    print("   " + "-" * 76)
+                    for line in preview.split('\n'):
+                        print(f"   {line}")
+                    print("   " + "-" * 76)
+                    
+                    # If this is the forecast endpoint, we're done!
+                    if 'danger' in preview.lower() or 'avalanche' in preview.lower():
+                        print(f"\n   🎯 This looks like the forecast data we need!")
+                        break
                 
-        elif response.status_code == 404:
-            print("   ❌ Not Found")
-        elif response.status_code == 403:
-            print("   ❌ Forbidden")
-        else:
-            print(f"   ❌ Status {response.status_code}")
+                except json.JSONDecodeError:
+                    print(f"   ⚠️ Response not JSON")
+                    print(f"   Content-Type: {response.headers.get('Content-Type')}")
             
-    except requests.exceptions.Timeout:
-        print("   ⏱️ Timeout")
-    except requests.exceptions.ConnectionError:
-        print("   ❌ Connection Error")
-    except Exception as e:
-        print(f"   ❌ Error: {e}")
+            elif response.status_code == 404:
+                print("   ❌ Not Found")
+            elif response.status_code == 403:
+                print("   ❌ Forbidden")
+            else:
+                print(f"   ❌ Status {response.status_code}")
+        
+        except requests.exceptions.Timeout:
+            print("   ⏱️ Timeout")
+        except requests.exceptions.ConnectionError:
+            print("   ❌ Connection Error")
+        except Exception as e:
+            print(f"   ❌ Error: {e}")
 
 print("\n" + "=" * 80)
 print("Testing complete!")
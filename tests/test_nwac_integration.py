@@ -10,6 +10,12 @@ import time
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+# Replay NOAA/NWAC responses from the on-disk cache on repeat runs
+# (only when run directly - pytest imports this file while collecting)
+from http_cache import install_http_cache, use_cassette
+if __name__ == "__main__":
+    install_http_cache()
+
 from tools.basic_tools import get_comprehensive_stevens_pass_data, analyze_snow_forecast_for_stevens_pass
 
 print("Testing NWAC Integration with Stevens Pass Tools")
@@ -20,7 +26,8 @@ print()
 print("TEST 1: Comprehensive Weather Data includes NWAC")
 print("-" * 80)
 try:
-    result = get_comprehensive_stevens_pass_data()
+    with use_cassette("nwac_integration"):
+        result = get_comprehensive_stevens_pass_data()
     
     # Check for NWAC content
     has_nwac = "NWAC AVALANCHE FORECAST" in result
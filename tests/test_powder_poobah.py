@@ -7,11 +7,11 @@ import sys
 import logging
 from pathlib import Path
 
-# Add the tools directory to path so we can import basic_tools
-tools_dir = Path(__file__).parent / "tools"
-sys.path.insert(0, str(tools_dir))
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from basic_tools import get_powder_poobah_latest_forecast
+from tools.basic_tools import get_powder_poobah_latest_forecast
+from http_cache import install_http_cache
 
 # Configure logging to see what's happening
 logging.basicConfig(
@@ -20,6 +20,7 @@ logging.basicConfig(
 )
 
 def main():
+    install_http_cache()
     print("=" * 70)
     print("Testing get_powder_poobah_latest_forecast()")
     print("=" * 70)
@@ -35,7 +36,7 @@ def main():
         else:
             print("⚠️ Function returned empty result")
             print("This might mean:")
-            print("  - BeautifulSoup4 is not installed (run: pip install beautifulsoup4)")
+            print("  - BeautifulSoup4 is not installed (run: pip install beautifulsoup4; lxml optional for faster parsing)")
             print("  - The website structure changed")
             print("  - Network connection issue")
             
@@ -1,8 +1,11 @@
 """
 Test script for the scheduled snow analysis feature.
 Tests scheduler setup, analysis execution, and Slack posting.
+
+Set RUN_FULL_ANALYSIS=1 to also run the full (~30s) snow analysis test.
 """
 
+import os
 import sys
 from pathlib import Path
 import asyncio
@@ -221,12 +224,11 @@ async def run_all_tests():
     print("OPTIONAL: Full Snow Analysis Test")
     print("=" * 80)
     print("This test will run the actual snow analysis (~30 seconds)")
-    response = input("Run full analysis test? (y/n): ").lower().strip()
     
-    if response == 'y':
+    if os.getenv("RUN_FULL_ANALYSIS") == "1":
         results.append(await test_snow_analysis_execution())
     else:
-        print("⏭️  Skipping full analysis test\n")
+        print("⏭️  Skipping full analysis test (set RUN_FULL_ANALYSIS=1 to run it)\n")
     
     # Summary
     print("=" * 80)
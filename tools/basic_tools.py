@@ -5,6 +5,10 @@ from langchain_core.tools import Tool
 import logging
 import requests
 import json
+import importlib.util
+import threading
+import time
+from concurrent.futures import Future
 from datetime import datetime
 from urllib3.util.retry import Retry
 from requests.adapters import HTTPAdapter
@@ -13,6 +17,18 @@ from plotly.subplots import make_subplots
 
 logger = logging.getLogger(__name__)
 
+# orjson decodes the large NOAA/NWAC payloads several times faster than the stdlib; optional
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# lxml parses HTML several times faster than BeautifulSoup's pure-Python parser; optional.
+# Only looked up here - BeautifulSoup imports it when a page is actually parsed.
+LXML_AVAILABLE = importlib.util.find_spec("lxml") is not None
+_FAST_HTML_PARSER = "lxml" if LXML_AVAILABLE else "html.parser"
+
 # Import Chainlit for rendering plots in chat
 try:
     import chainlit as cl
@@ -26,6 +42,13 @@ def search_knowledge(query: str) -> str:
     return f"Found information about: {query}"
 
 
+def _parse_json(response: requests.Response) -> Any:
+    """Decode a JSON HTTP response body, with orjson when available"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(response.content)
+    return response.json()
+
+
 def _create_session_with_retries():
     """Create a requests session with retry logic and longer timeout"""
     session = requests.Session()
@@ -41,245 +64,278 @@ def _create_session_with_retries():
     return session
 
 
-def generate_stevens_pass_weather_plots(grid_data: dict) -> dict:
+# Plot payload trimming: hover precision and a cap on points per trace
+_PLOT_VALUE_DIGITS = 2
+_PLOT_MAX_POINTS = 500
+
+
+def _plot_values(values) -> list:
+    """Round trace values to display precision - full float reprs bloat the figure JSON"""
+    return [round(v, _PLOT_VALUE_DIGITS) if isinstance(v, float) else v for v in values]
+
+
+def _extract_time_value_pairs(param_dict: dict) -> list:
+    """Extract time-sorted (datetime, value) tuples from a NOAA grid parameter"""
+    from datetime import timedelta
+    pairs = []
+
+    for val in param_dict.get("values", []):
+        valid_time = val.get("validTime", "")
+        value = val.get("value", None)
+        if value is not None and valid_time:
+            # Parse ISO 8601 time format
+            try:
+                # Format: "2025-11-29T15:00:00+00:00/PT2H"
+                time_str = valid_time.split('/')[0]
+                dt = datetime.fromisoformat(time_str.replace('Z', '+00:00'))
+                # Convert UTC to Pacific Time (UTC-8, or UTC-7 during DST)
+                # Simply subtract 8 hours for now (will be -7 during daylight saving)
+                dt_pacific = dt - timedelta(hours=8)
+                # Remove timezone info for plotting (keep local time only)
+                dt_naive = dt_pacific.replace(tzinfo=None)
+                pairs.append((dt_naive, value))
+            except Exception as e:
+                logger.warning(f"Could not parse time {valid_time}: {e}")
+    pairs.sort(key=lambda x: x[0])
+    # Decimate very long series to roughly display resolution
+    if len(pairs) > _PLOT_MAX_POINTS:
+        step = -(-len(pairs) // _PLOT_MAX_POINTS)
+        pairs = pairs[::step]
+    return pairs
+
+
+def _apply_chart_layout(fig) -> None:
+    """Shared layout for the Stevens Pass chart figures"""
+    fig.update_layout(
+        height=700,
+        showlegend=False,
+        hovermode="x unified",
+        font=dict(size=10),
+        margin=dict(l=40, r=40, t=40, b=40)
+    )
+
+
+def build_precip_wind_figure(grid_data: dict):
     """
     [HELPER FUNCTION]
-    Generate Plotly visualizations for Stevens Pass weather data.
-    Creates two grouped Plotly figures for better readability in chat:
-    - Figure 1: Precipitation & Wind (4 plots)
-    - Figure 2: Temperature & Humidity (4 plots)
-    
-    Args:
-        grid_data: The forecast grid data from NOAA API
-        
-    Returns:
-        Dictionary with 'figures' (list of Plotly figures), and 'status' message
+    Figure 1: Precipitation & Wind (snowfall, precipitation, wind speed/gusts, wind direction).
+    Independent of the temperature figure, so the two can be built concurrently.
     """
-    try:
-        logger.info("Generating weather plots for Stevens Pass...")
-        grid_props = grid_data.get("properties", {})
-        
-        # Create first figure: Precipitation & Wind Analysis (2x2)
-        fig1 = make_subplots(
-            rows=2, cols=2,
-            subplot_titles=(
-                "Snowfall Forecast", "Precipitation Forecast",
-                "Wind Speed & Gusts", "Wind Direction"
-            ),
-            specs=[[{"secondary_y": False}, {"secondary_y": False}],
-                   [{"secondary_y": False}, {"secondary_y": False}]],
-            vertical_spacing=0.15,
-            horizontal_spacing=0.15
-        )
-        
-        # Create second figure: Temperature & Humidity Analysis (2x2)
-        fig2 = make_subplots(
-            rows=2, cols=2,
-            subplot_titles=(
-                "Temperature Trends", "Apparent Temperature",
-                "Dewpoint & Humidity", "Visibility Forecast"
-            ),
-            specs=[[{"secondary_y": False}, {"secondary_y": False}],
-                   [{"secondary_y": False}, {"secondary_y": False}]],
-            vertical_spacing=0.15,
-            horizontal_spacing=0.15
-        )
-        
-        # Helper function to parse time and value from grid data
-        def extract_time_value_pairs(param_dict):
-            """Extract (datetime, value) tuples from NOAA grid parameter"""
-            from datetime import timedelta
-            pairs = []
-            
-            for val in param_dict.get("values", []):
-                valid_time = val.get("validTime", "")
-                value = val.get("value", None)
-                if value is not None and valid_time:
-                    # Parse ISO 8601 time format
-                    try:
-                        # Format: "2025-11-29T15:00:00+00:00/PT2H"
-                        time_str = valid_time.split('/')[0]
-                        dt = datetime.fromisoformat(time_str.replace('Z', '+00:00'))
-                        # Convert UTC to Pacific Time (UTC-8, or UTC-7 during DST)
-                        # Simply subtract 8 hours for now (will be -7 during daylight saving)
-                        dt_pacific = dt - timedelta(hours=8)
-                        # Remove timezone info for plotting (keep local time only)
-                        dt_naive = dt_pacific.replace(tzinfo=None)
-                        pairs.append((dt_naive, value))
-                    except Exception as e:
-                        logger.warning(f"Could not parse time {valid_time}: {e}")
-            return sorted(pairs, key=lambda x: x[0])
-        
-        # Plot 1: Snowfall Forecast (Figure 1, Row 1, Col 1)
-        snow_data = grid_props.get("snowfallAmount", {})
-        if snow_data.get("values"):
-            # Extract and convert snowfall from mm to inches
-            snow_pairs = extract_time_value_pairs(snow_data)
-            if snow_pairs:
-                times, values_mm = zip(*snow_pairs)
-                # Convert from millimeters to inches (1 inch = 25.4 mm)
-                values_inches = [v / 25.4 for v in values_mm]
-                fig1.add_trace(
-                    go.Bar(x=list(times), y=values_inches, name="Snowfall (in)", marker_color="lightblue"),
-                    row=1, col=1
-                )
-                fig1.update_yaxes(title_text="Inches", row=1, col=1)
-        
-        # Plot 2: Precipitation Forecast (Figure 1, Row 1, Col 2)
-        precip_data = grid_props.get("quantitativePrecipitation", {})
-        if precip_data.get("values"):
-            # Extract and convert precipitation from mm to inches
-            precip_pairs = extract_time_value_pairs(precip_data)
-            if precip_pairs:
-                times, values_mm = zip(*precip_pairs)
-                # Convert from millimeters to inches (1 inch = 25.4 mm)
-                values_inches = [v / 25.4 for v in values_mm]
+    grid_props = grid_data.get("properties", {})
+    
+    # Create first figure: Precipitation & Wind Analysis (2x2)
+    fig1 = make_subplots(
+        rows=2, cols=2,
+        subplot_titles=(
+            "Snowfall Forecast", "Precipitation Forecast",
+            "Wind Speed & Gusts", "Wind Direction"
+        ),
+        specs=[[{"secondary_y": False}, {"secondary_y": False}],
+               [{"secondary_y": False}, {"secondary_y": False}]],
+        vertical_spacing=0.15,
+        horizontal_spacing=0.15
+    )
+    
+    # Plot 1: Snowfall Forecast (Figure 1, Row 1, Col 1)
+    snow_data = grid_props.get("snowfallAmount", {})
+    if snow_data.get("values"):
+        # Extract and convert snowfall from mm to inches
+        snow_pairs = _extract_time_value_pairs(snow_data)
+        if snow_pairs:
+            times, values_mm = zip(*snow_pairs)
+            # Convert from millimeters to inches (1 inch = 25.4 mm)
+            values_inches = [v / 25.4 for v in values_mm]
+            fig1.add_trace(
+                go.Bar(x=list(times), y=_plot_values(values_inches), name="Snowfall (in)", marker_color="lightblue"),
+                row=1, col=1
+            )
+            fig1.update_yaxes(title_text="Inches", row=1, col=1)
+
+    # Plot 2: Precipitation Forecast (Figure 1, Row 1, Col 2)
+    precip_data = grid_props.get("quantitativePrecipitation", {})
+    if precip_data.get("values"):
+        # Extract and convert precipitation from mm to inches
+        precip_pairs = _extract_time_value_pairs(precip_data)
+        if precip_pairs:
+            times, values_mm = zip(*precip_pairs)
+            # Convert from millimeters to inches (1 inch = 25.4 mm)
+            values_inches = [v / 25.4 for v in values_mm]
+            fig1.add_trace(
+                go.Bar(x=list(times), y=_plot_values(values_inches), name="Precipitation (in)", marker_color="steelblue"),
+                row=1, col=2
+            )
+            fig1.update_yaxes(title_text="Inches", row=1, col=2)
+
+    # Plot 3: Wind Speed & Gusts (Figure 1, Row 2, Col 1)
+    wind_speed_data = grid_props.get("windSpeed", {})
+    wind_gust_data = grid_props.get("windGust", {})
+    if wind_speed_data.get("values") or wind_gust_data.get("values"):
+        if wind_speed_data.get("values"):
+            times, values = zip(*pairs) if (pairs := _extract_time_value_pairs(wind_speed_data)) else ([], [])
+            if times:
                 fig1.add_trace(
-                    go.Bar(x=list(times), y=values_inches, name="Precipitation (in)", marker_color="steelblue"),
-                    row=1, col=2
+                    go.Scatter(x=list(times), y=_plot_values(values), name="Wind Speed (mph)", mode="lines", line=dict(color="green")),
+                    row=2, col=1
                 )
-                fig1.update_yaxes(title_text="Inches", row=1, col=2)
-        
-        # Plot 3: Wind Speed & Gusts (Figure 1, Row 2, Col 1)
-        wind_speed_data = grid_props.get("windSpeed", {})
-        wind_gust_data = grid_props.get("windGust", {})
-        if wind_speed_data.get("values") or wind_gust_data.get("values"):
-            if wind_speed_data.get("values"):
-                times, values = zip(*extract_time_value_pairs(wind_speed_data)) if extract_time_value_pairs(wind_speed_data) else ([], [])
-                if times:
-                    fig1.add_trace(
-                        go.Scatter(x=list(times), y=list(values), name="Wind Speed (mph)", mode="lines", line=dict(color="green")),
-                        row=2, col=1
-                    )
-            if wind_gust_data.get("values"):
-                times, values = zip(*extract_time_value_pairs(wind_gust_data)) if extract_time_value_pairs(wind_gust_data) else ([], [])
-                if times:
-                    fig1.add_trace(
-                        go.Scatter(x=list(times), y=list(values), name="Wind Gust (mph)", mode="lines", line=dict(color="orange", dash="dash")),
-                        row=2, col=1
-                    )
-            fig1.update_yaxes(title_text="MPH", row=2, col=1)
-        
-        # Plot 4: Wind Direction (Figure 1, Row 2, Col 2)
-        wind_dir_data = grid_props.get("windDirection", {})
-        if wind_dir_data.get("values"):
-            times, values = zip(*extract_time_value_pairs(wind_dir_data)) if extract_time_value_pairs(wind_dir_data) else ([], [])
+        if wind_gust_data.get("values"):
+            times, values = zip(*pairs) if (pairs := _extract_time_value_pairs(wind_gust_data)) else ([], [])
             if times:
                 fig1.add_trace(
-                    go.Scatter(x=list(times), y=list(values), name="Wind Direction (°)", mode="markers", marker=dict(size=6, color="purple")),
-                    row=2, col=2
+                    go.Scatter(x=list(times), y=_plot_values(values), name="Wind Gust (mph)", mode="lines", line=dict(color="orange", dash="dash")),
+                    row=2, col=1
                 )
-                fig1.update_yaxes(title_text="Degrees", row=2, col=2)
-        
-        # Plot 5: Temperature - Actual, High, and Low (Figure 2, Row 1, Col 1)
-        temp_data = grid_props.get("temperature", {})
-        max_temp_data = grid_props.get("maxTemperature", {})
-        min_temp_data = grid_props.get("minTemperature", {})
-        
-        # Helper function to convert Celsius to Fahrenheit
-        def celsius_to_fahrenheit(celsius_list):
-            return [(c * 9/5) + 32 for c in celsius_list]
-        
-        # Get actual temperature (hourly)
-        temp_pairs = extract_time_value_pairs(temp_data) if temp_data.get("values") else []
-        
-        # Get max and min temperatures (daily)
-        max_pairs = extract_time_value_pairs(max_temp_data) if max_temp_data.get("values") else []
-        min_pairs = extract_time_value_pairs(min_temp_data) if min_temp_data.get("values") else []
-        
-        if temp_pairs:
-            times, values = zip(*temp_pairs)
-            temp_f = celsius_to_fahrenheit(list(values))
+        fig1.update_yaxes(title_text="MPH", row=2, col=1)
+
+    # Plot 4: Wind Direction (Figure 1, Row 2, Col 2)
+    wind_dir_data = grid_props.get("windDirection", {})
+    if wind_dir_data.get("values"):
+        times, values = zip(*pairs) if (pairs := _extract_time_value_pairs(wind_dir_data)) else ([], [])
+        if times:
+            fig1.add_trace(
+                go.Scatter(x=list(times), y=_plot_values(values), name="Wind Direction (°)", mode="markers", marker=dict(size=6, color="purple")),
+                row=2, col=2
+            )
+            fig1.update_yaxes(title_text="Degrees", row=2, col=2)
+    
+    _apply_chart_layout(fig1)
+    return fig1
+
+
+def build_temperature_figure(grid_data: dict):
+    """
+    [HELPER FUNCTION]
+    Figure 2: Temperature & Humidity (temperature, apparent temperature, dewpoint/humidity, visibility).
+    """
+    grid_props = grid_data.get("properties", {})
+    
+    # Create second figure: Temperature & Humidity Analysis (2x2)
+    fig2 = make_subplots(
+        rows=2, cols=2,
+        subplot_titles=(
+            "Temperature Trends", "Apparent Temperature",
+            "Dewpoint & Humidity", "Visibility Forecast"
+        ),
+        specs=[[{"secondary_y": False}, {"secondary_y": False}],
+               [{"secondary_y": False}, {"secondary_y": False}]],
+        vertical_spacing=0.15,
+        horizontal_spacing=0.15
+    )
+    
+    # Plot 5: Temperature - Actual, High, and Low (Figure 2, Row 1, Col 1)
+    temp_data = grid_props.get("temperature", {})
+    max_temp_data = grid_props.get("maxTemperature", {})
+    min_temp_data = grid_props.get("minTemperature", {})
+
+    # Helper function to convert Celsius to Fahrenheit
+    def celsius_to_fahrenheit(celsius_list):
+        return [(c * 9/5) + 32 for c in celsius_list]
+
+    # Get actual temperature (hourly)
+    temp_pairs = _extract_time_value_pairs(temp_data) if temp_data.get("values") else []
+
+    # Get max and min temperatures (daily)
+    max_pairs = _extract_time_value_pairs(max_temp_data) if max_temp_data.get("values") else []
+    min_pairs = _extract_time_value_pairs(min_temp_data) if min_temp_data.get("values") else []
+
+    if temp_pairs:
+        times, values = zip(*temp_pairs)
+        temp_f = celsius_to_fahrenheit(list(values))
+        fig2.add_trace(
+            go.Scatter(x=list(times), y=_plot_values(temp_f), name="Temp (°F)", mode="lines", line=dict(color="gray", width=1)),
+            row=1, col=1
+        )
+
+    if max_pairs:
+        max_times, max_values = zip(*max_pairs)
+        max_f = celsius_to_fahrenheit(list(max_values))
+        fig2.add_trace(
+            go.Scatter(x=list(max_times), y=_plot_values(max_f), name="High (°F)", mode="lines+markers", line=dict(color="red", width=2), marker=dict(size=5)),
+            row=1, col=1
+        )
+
+    if min_pairs:
+        min_times, min_values = zip(*min_pairs)
+        min_f = celsius_to_fahrenheit(list(min_values))
+        fig2.add_trace(
+            go.Scatter(x=list(min_times), y=_plot_values(min_f), name="Low (°F)", mode="lines+markers", line=dict(color="blue", width=2), marker=dict(size=5),
+                      fill="tonexty", fillcolor="rgba(100,150,255,0.2)"),
+            row=1, col=1
+        )
+
+    fig2.update_yaxes(title_text="°F", row=1, col=1)
+
+    # Plot 6: Apparent Temperature (Figure 2, Row 1, Col 2)
+    apparent_temp_data = grid_props.get("apparentTemperature", {})
+    if apparent_temp_data.get("values"):
+        pairs = _extract_time_value_pairs(apparent_temp_data)
+        if pairs:
+            times, values = zip(*pairs)
+            apparent_f = celsius_to_fahrenheit(list(values))
             fig2.add_trace(
-                go.Scatter(x=list(times), y=temp_f, name="Temp (°F)", mode="lines", line=dict(color="gray", width=1)),
-                row=1, col=1
+                go.Scatter(x=list(times), y=_plot_values(apparent_f), name="Apparent Temp (°F)", mode="lines", line=dict(color="darkred")),
+                row=1, col=2
             )
-        
-        if max_pairs:
-            max_times, max_values = zip(*max_pairs)
-            max_f = celsius_to_fahrenheit(list(max_values))
+            fig2.update_yaxes(title_text="°F", row=1, col=2)
+
+    # Plot 7: Dewpoint & Humidity (Figure 2, Row 2, Col 1)
+    dew_data = grid_props.get("dewpoint", {})
+    humidity_data = grid_props.get("relativeHumidity", {})
+    if dew_data.get("values"):
+        pairs = _extract_time_value_pairs(dew_data)
+        if pairs:
+            times, values = zip(*pairs)
+            dew_f = celsius_to_fahrenheit(list(values))
             fig2.add_trace(
-                go.Scatter(x=list(max_times), y=max_f, name="High (°F)", mode="lines+markers", line=dict(color="red", width=2), marker=dict(size=5)),
-                row=1, col=1
+                go.Scatter(x=list(times), y=_plot_values(dew_f), mode="lines", name="Dewpoint (°F)", line=dict(color="cyan")),
+                row=2, col=1
             )
-        
-        if min_pairs:
-            min_times, min_values = zip(*min_pairs)
-            min_f = celsius_to_fahrenheit(list(min_values))
+    if humidity_data.get("values"):
+        times, values = zip(*pairs) if (pairs := _extract_time_value_pairs(humidity_data)) else ([], [])
+        if times:
             fig2.add_trace(
-                go.Scatter(x=list(min_times), y=min_f, name="Low (°F)", mode="lines+markers", line=dict(color="blue", width=2), marker=dict(size=5),
-                          fill="tonexty", fillcolor="rgba(100,150,255,0.2)"),
-                row=1, col=1
+                go.Scatter(x=list(times), y=_plot_values(values), name="Humidity (%)", mode="lines", line=dict(color="blue")),
+                row=2, col=1
             )
-        
-        fig2.update_yaxes(title_text="°F", row=1, col=1)
-        
-        # Plot 6: Apparent Temperature (Figure 2, Row 1, Col 2)
-        apparent_temp_data = grid_props.get("apparentTemperature", {})
-        if apparent_temp_data.get("values"):
-            pairs = extract_time_value_pairs(apparent_temp_data)
-            if pairs:
-                times, values = zip(*pairs)
-                apparent_f = celsius_to_fahrenheit(list(values))
-                fig2.add_trace(
-                    go.Scatter(x=list(times), y=apparent_f, name="Apparent Temp (°F)", mode="lines", line=dict(color="darkred")),
-                    row=1, col=2
-                )
-                fig2.update_yaxes(title_text="°F", row=1, col=2)
-        
-        # Plot 7: Dewpoint & Humidity (Figure 2, Row 2, Col 1)
-        dew_data = grid_props.get("dewpoint", {})
-        humidity_data = grid_props.get("relativeHumidity", {})
-        if dew_data.get("values"):
-            pairs = extract_time_value_pairs(dew_data)
-            if pairs:
-                times, values = zip(*pairs)
-                dew_f = celsius_to_fahrenheit(list(values))
-                fig2.add_trace(
-                    go.Scatter(x=list(times), y=dew_f, mode="lines", name="Dewpoint (°F)", line=dict(color="cyan")),
-                    row=2, col=1
-                )
-        if humidity_data.get("values"):
-            times, values = zip(*extract_time_value_pairs(humidity_data)) if extract_time_value_pairs(humidity_data) else ([], [])
-            if times:
+    fig2.update_yaxes(title_text="°F / %", row=2, col=1)
+
+    # Plot 8: Visibility (Figure 2, Row 2, Col 2)
+    visibility_data = grid_props.get("visibility", {})
+    if visibility_data.get("values"):
+        pairs = _extract_time_value_pairs(visibility_data)
+        if pairs:
+            times, values = zip(*pairs)
+            # Filter out None values and convert to miles
+            valid_pairs = [(t, v / 1609.34 if v and v > 1000 else v) for t, v in zip(times, values) if v is not None]
+            if valid_pairs:
+                times, values_miles = zip(*valid_pairs)
                 fig2.add_trace(
-                    go.Scatter(x=list(times), y=list(values), name="Humidity (%)", mode="lines", line=dict(color="blue")),
-                    row=2, col=1
+                    go.Scatter(x=list(times), y=_plot_values(values_miles), name="Visibility (miles)", mode="lines", line=dict(color="brown")),
+                    row=2, col=2
                 )
-        fig2.update_yaxes(title_text="°F / %", row=2, col=1)
-        
-        # Plot 8: Visibility (Figure 2, Row 2, Col 2)
-        visibility_data = grid_props.get("visibility", {})
-        if visibility_data.get("values"):
-            pairs = extract_time_value_pairs(visibility_data)
-            if pairs:
-                times, values = zip(*pairs)
-                # Filter out None values and convert to miles
-                valid_pairs = [(t, v / 1609.34 if v and v > 1000 else v) for t, v in zip(times, values) if v is not None]
-                if valid_pairs:
-                    times, values_miles = zip(*valid_pairs)
-                    fig2.add_trace(
-                        go.Scatter(x=list(times), y=list(values_miles), name="Visibility (miles)", mode="lines", line=dict(color="brown")),
-                        row=2, col=2
-                    )
-                    fig2.update_yaxes(title_text="Miles", row=2, col=2)
-        
-        # Update layout for both figures
-        fig1.update_layout(
-            height=700,
-            showlegend=False,
-            hovermode="x unified",
-            font=dict(size=10),
-            margin=dict(l=40, r=40, t=40, b=40)
-        )
+                fig2.update_yaxes(title_text="Miles", row=2, col=2)
+    
+    _apply_chart_layout(fig2)
+    return fig2
+
+
+def generate_stevens_pass_weather_plots(grid_data: dict) -> dict:
+    """
+    [HELPER FUNCTION]
+    Generate Plotly visualizations for Stevens Pass weather data.
+    Creates two grouped Plotly figures for better readability in chat:
+    - Figure 1: Precipitation & Wind (4 plots)
+    - Figure 2: Temperature & Humidity (4 plots)
+    
+    Args:
+        grid_data: The forecast grid data from NOAA API
         
-        fig2.update_layout(
-            height=700,
-            showlegend=False,
-            hovermode="x unified",
-            font=dict(size=10),
-            margin=dict(l=40, r=40, t=40, b=40)
-        )
+    Returns:
+        Dictionary with 'figure1' and 'figure2' (Plotly figures, None on failure) and 'status' message
+    """
+    try:
+        logger.info("Generating weather plots for Stevens Pass...")
+        fig1 = build_precip_wind_figure(grid_data)
+        fig2 = build_temperature_figure(grid_data)
         
         logger.info("✓ Weather plots generated")
         
@@ -353,9 +409,8 @@ def send_plots_to_chainlit_sync(plot_data: dict) -> None:
         try:
             loop = asyncio.get_running_loop()
             logger.info(f"Found running event loop: {loop}")
-            # We're in an async context - schedule the coroutine as a task
-            # Use ensure_future to create a task that will execute
-            future = asyncio.ensure_future(send_plots_to_chainlit(plot_data))
+            # We're in an async context - schedule the coroutine on the loop we already hold
+            future = loop.create_task(send_plots_to_chainlit(plot_data))
             logger.info(f"✓ Plot message task created: {future}")
         except RuntimeError as e:
             # No running loop - this shouldn't happen in Chainlit context but handle it anyway
@@ -396,7 +451,7 @@ def get_noaa_area_forecast_discussion() -> str:
             try:
                 response = session.get(afd_url, timeout=timeout)
                 response.raise_for_status()
-                data = response.json()
+                data = _parse_json(response)
                 
                 # Handle @graph structure (JSON-LD format)
                 products = data.get("@graph", [])
@@ -421,7 +476,7 @@ def get_noaa_area_forecast_discussion() -> str:
                 logger.info(f"Fetching full {wfo_code} product from: {product_url}")
                 product_response = session.get(product_url, timeout=timeout)
                 product_response.raise_for_status()
-                product_data = product_response.json()
+                product_data = _parse_json(product_response)
                 
                 # Extract information
                 product_text = product_data.get("productText", "")
@@ -503,18 +558,96 @@ def get_noaa_area_forecast_discussion() -> str:
         return f"Error processing Area Forecast Discussions: {str(e)}"
 
 
-def _fetch_stevens_pass_detailed_data() -> dict:
+def _cached_single_flight(cache: dict, lock: threading.Lock, ttl: float, fetch, keep, force_refresh: bool = False):
+    """
+    Return cache["data"] while younger than ttl, otherwise fetch(), storing the result
+    when keep(result) is true. The lock only guards the cache dict - the fetch itself
+    runs outside it. Concurrent misses wait on the one in-flight fetch's Future
+    (cache["inflight"]) instead of starting their own, so cache hits and clears never
+    wait on network I/O.
+    """
+    with lock:
+        cached = cache["data"]
+        if not force_refresh and cached and time.monotonic() - cache["ts"] < ttl:
+            return cached
+        inflight = cache["inflight"]
+        owner = inflight is None
+        if owner:
+            inflight = cache["inflight"] = Future()
+    
+    if not owner:
+        # Joins the fetch already running (fresh data, so this also serves force_refresh)
+        return inflight.result()
+    
+    try:
+        result = fetch()
+    except BaseException as e:
+        with lock:
+            if cache["inflight"] is inflight:
+                cache["inflight"] = None
+        inflight.set_exception(e)
+        raise
+    
+    with lock:
+        # A clear during the fetch detaches it - don't repopulate the cache then
+        if cache["inflight"] is inflight:
+            cache["inflight"] = None
+            if keep(result):
+                cache["data"] = result
+                cache["ts"] = time.monotonic()
+    inflight.set_result(result)
+    return result
+
+
+# NOAA refreshes gridpoint forecasts roughly hourly; keep the cache well inside that
+_DETAILED_DATA_TTL = 600
+_detailed_data_cache = {"ts": 0.0, "data": None, "inflight": None}
+_detailed_data_lock = threading.Lock()
+
+
+def _fetch_stevens_pass_detailed_data(force_refresh: bool = False) -> dict:
     """
     [HELPER FUNCTION]
     Fetches all detailed grid data for Stevens Pass and returns structured data.
     Used internally by comprehensive data function and analysis.
     
+    Results are cached for _DETAILED_DATA_TTL seconds so the snow analysis tool and
+    the chart generation that follows it share one NOAA fetch. Concurrent callers
+    wait on the in-flight fetch instead of starting their own. The returned dict is
+    shared - treat it as read-only.
+    
+    Args:
+        force_refresh: Bypass the cache and fetch fresh data
+    
     Returns a dict with:
     - grid_data: Raw NOAA grid data
     - forecast_data: Forecast periods
     - alerts_data: Active alerts
     - location_info: Location metadata
+    - failed_sections: Names of the sections above that could not be fetched
+      ("forecast", "grid", "alerts") - such partial results are not cached
     """
+    return _cached_single_flight(
+        _detailed_data_cache,
+        _detailed_data_lock,
+        _DETAILED_DATA_TTL,
+        _fetch_stevens_pass_detailed_data_uncached,
+        # Only cache complete fetches so a NOAA hiccup isn't pinned for the TTL
+        keep=lambda result_data: not result_data["failed_sections"],
+        force_refresh=force_refresh,
+    )
+
+
+def clear_stevens_pass_data_cache() -> None:
+    """Drop the cached Stevens Pass detailed data (next call refetches from NOAA)"""
+    with _detailed_data_lock:
+        _detailed_data_cache["data"] = None
+        _detailed_data_cache["ts"] = 0.0
+        _detailed_data_cache["inflight"] = None
+
+
+def _fetch_stevens_pass_detailed_data_uncached() -> dict:
+    """Fetch Stevens Pass grid, forecast, alerts and location data from NOAA"""
     session = _create_session_with_retries()
     timeout = 30
     
@@ -525,7 +658,7 @@ def _fetch_stevens_pass_detailed_data() -> dict:
     points_url = f"https://api.weather.gov/points/{latitude},{longitude}"
     points_response = session.get(points_url, timeout=timeout)
     points_response.raise_for_status()
-    points_data = points_response.json()
+    points_data = _parse_json(points_response)
     
     props = points_data.get("properties", {})
     
@@ -541,6 +674,7 @@ def _fetch_stevens_pass_detailed_data() -> dict:
             "timezone": props.get("timeZone"),
             "city": props.get("relativeLocation", {}).get("properties", {}).get("city", "Unknown"),
             "state": props.get("relativeLocation", {}).get("properties", {}).get("state", "Unknown"),
+            "description": props.get("relativeLocation", {}).get("properties", {}).get("description", ""),
         }
     }
     
@@ -553,7 +687,7 @@ def _fetch_stevens_pass_detailed_data() -> dict:
         try:
             forecast_response = session.get(forecast_url, timeout=timeout)
             forecast_response.raise_for_status()
-            result_data["forecast_data"] = forecast_response.json()
+            result_data["forecast_data"] = _parse_json(forecast_response)
         except Exception as e:
             logger.warning(f"Could not fetch forecast data: {e}")
     
@@ -562,7 +696,7 @@ def _fetch_stevens_pass_detailed_data() -> dict:
         try:
             grid_response = session.get(forecast_grid_url, timeout=timeout)
             grid_response.raise_for_status()
-            result_data["grid_data"] = grid_response.json()
+            result_data["grid_data"] = _parse_json(grid_response)
         except Exception as e:
             logger.warning(f"Could not fetch grid data: {e}")
     
@@ -571,10 +705,14 @@ def _fetch_stevens_pass_detailed_data() -> dict:
         try:
             alerts_response = session.get(alerts_url, timeout=timeout)
             alerts_response.raise_for_status()
-            result_data["alerts_data"] = alerts_response.json()
+            result_data["alerts_data"] = _parse_json(alerts_response)
         except Exception as e:
             logger.warning(f"Could not fetch alerts: {e}")
     
+    result_data["failed_sections"] = [
+        section for section in ("forecast", "grid", "alerts")
+        if result_data[f"{section}_data"] is None
+    ]
     return result_data
 
 
@@ -727,11 +865,13 @@ def get_comprehensive_stevens_pass_data() -> str:
     
     Location: Stevens Pass - Tye Mill (STS54)
     Coordinates: 47.7462°N, 121.0859°W (Elevation: ~5,180 ft)
+    
+    Reads the shared (TTL-cached) detailed NOAA fetch, so this tool, the snow analysis
+    and the chart generation all reuse one set of NOAA requests. If the forecast or
+    alerts could not be fetched, the report starts with a ⚠️ line saying so (which
+    also keeps the partial report out of the agent's tool result cache).
     """
     try:
-        session = _create_session_with_retries()
-        timeout = 30
-        
         # Stevens Pass - Tye Mill (STS54) coordinates
         latitude = 47.7462
         longitude = -121.0859
@@ -739,30 +879,28 @@ def get_comprehensive_stevens_pass_data() -> str:
         elevation_ft = 5180
         
         logger.info(f"Fetching comprehensive data for {location_name}...")
-        
-        # Validate location by fetching grid points first
-        logger.info(f"Validating location: {latitude}, {longitude}")
-        points_url = f"https://api.weather.gov/points/{latitude},{longitude}"
-        points_response = session.get(points_url, timeout=timeout)
-        points_response.raise_for_status()
-        points_data = points_response.json()
-        
-        props = points_data.get("properties", {})
+        detailed_data = _fetch_stevens_pass_detailed_data()
+        location_info = detailed_data["location_info"]
         
         # Extract location validation info
-        grid_id = props.get("gridId")
-        wfo = props.get("cwa")  # County Warning Area / Forecast Office
-        timezone = props.get("timeZone")
-        relative_location = props.get("relativeLocation", {}).get("properties", {})
+        grid_id = location_info.get("grid_id")
+        wfo = location_info.get("wfo")  # County Warning Area / Forecast Office
+        timezone = location_info.get("timezone")
         
         logger.info(f"✓ Location validated - WFO: {wfo}, Grid: {grid_id}, Timezone: {timezone}")
         
         # Verify this is correct location
-        city = relative_location.get("city", "Unknown")
-        state = relative_location.get("state", "Unknown")
-        distance_description = relative_location.get("description", "")
+        city = location_info.get("city", "Unknown")
+        state = location_info.get("state", "Unknown")
+        distance_description = location_info.get("description", "")
         
         data_sections = []
+        missing = [
+            section for section in ("forecast", "alerts")
+            if section in detailed_data.get("failed_sections", ())
+        ]
+        if missing:
+            data_sections.append(f"⚠️ Partial NOAA data - could not fetch: {', '.join(missing)}\n")
         data_sections.append(f"📍 **Location: {location_name}**")
         data_sections.append(f"   Coordinates: {latitude}°N, {longitude}°W")
         data_sections.append(f"   Elevation: {elevation_ft} ft")
@@ -772,18 +910,9 @@ def get_comprehensive_stevens_pass_data() -> str:
         data_sections.append(f"   Grid ID: {grid_id}")
         data_sections.append(f"   Timezone: {timezone}\n")
         
-        forecast_url = props.get("forecast")
-        forecast_grid_url = props.get("forecastGridData")
-        alerts_url = props.get("alerts")
-        
-        # 2. Get forecast
-        logger.info("Fetching forecast data")
-        grid_data = None
-        if forecast_url:
-            forecast_response = session.get(forecast_url, timeout=timeout)
-            forecast_response.raise_for_status()
-            forecast_data = forecast_response.json()
-            
+        # Forecast periods
+        forecast_data = detailed_data.get("forecast_data")
+        if forecast_data:
             periods = forecast_data.get("properties", {}).get("periods", [])
             num_periods = len(periods)
             data_sections.append(f"🌡️ **Forecast Periods** ({num_periods} periods available):")
@@ -798,74 +927,29 @@ def get_comprehensive_stevens_pass_data() -> str:
                     forecast = f"**{forecast}**"
                 
                 data_sections.append(f"  • {name}: {forecast} ({temp}°F, {wind})")
-        
-        # Helper to format time strings for readability
-        def format_forecast_time(valid_time_str):
-            """Convert ISO 8601 time format to readable format"""
-            try:
-                # Format: "2025-11-29T15:00:00+00:00/PT2H"
-                time_part = valid_time_str.split('/')[0]
-                dt = datetime.fromisoformat(time_part.replace('Z', '+00:00'))
-                # Format as: "Sat 11/29 3:00 PM"
-                return dt.strftime("%a %m/%d %I:%M %p")
-            except Exception:
-                return valid_time_str
-        
-        # 3. Get detailed grid data (precipitation, snow, wind, hazards, etc.)
-        logger.info("Fetching detailed grid forecast data")
-        if forecast_grid_url:
-            try:
-                grid_response = session.get(forecast_grid_url, timeout=timeout)
-                grid_response.raise_for_status()
-                grid_data = grid_response.json()
-                
-                grid_props = grid_data.get("properties", {})
-                
-                # Extract snowfall (critical for powder forecasting)
-                # Data is retrieved internally but not displayed in chat
-                snow = grid_props.get("snowfallAmount", {})
-                
-                # Extract quantitative precipitation
-                # Data is retrieved internally but not displayed in chat
-                qpf = grid_props.get("quantitativePrecipitation", {})
-                
-                # Wind gust (affects snow quality and avalanche risk)
-                # Data is retrieved internally but not displayed in chat
-                wind_gust = grid_props.get("windGust", {})
-                
-                # NOTE: All other data is still retrieved but not displayed in chat
-                # This includes: wind speed, wind direction, visibility, ceiling height, wind chill,
-                # apparent temperature, dew point, humidity, pressure, probability of precipitation,
-                # and hazards. This data is still available in grid_data for analysis functions.
-                # These details will be shown visually in the Plotly charts.
-            
-            except Exception as e:
-                logger.warning(f"Could not fetch detailed grid data: {e}")
-        
-        # 4. NOTE: Plot generation moved to app.py for proper async context
-        # The grid_data is returned and plots are generated in the Chainlit context
-        
-        # 5. Get alerts/warnings
-        logger.info("Fetching active alerts")
-        if alerts_url:
-            try:
-                alerts_response = session.get(alerts_url, timeout=timeout)
-                alerts_response.raise_for_status()
-                alerts_data = alerts_response.json()
-                
-                features = alerts_data.get("features", [])
-                if features:
-                    data_sections.append("\n⚠️ **Active Alerts/Warnings**:")
-                    for alert in features:
-                        alert_props = alert.get("properties", {})
-                        event = alert_props.get("event", "Alert")
-                        headline = alert_props.get("headline", "")
-                        severity = alert_props.get("severity", "Unknown")
-                        data_sections.append(f"  • [{severity}] {event}: {headline}")
-                else:
-                    data_sections.append("\n✓ No active alerts")
-            except Exception as e:
-                logger.warning(f"Could not fetch alerts: {e}")
+        else:
+            data_sections.append("🌡️ **Forecast Periods**: Forecast unavailable (NOAA request failed)")
+        
+        # NOTE: Grid data (snowfall, precipitation, wind, hazards, etc.) is not displayed in chat.
+        # It is still in the detailed data for the analysis functions and is shown visually
+        # in the Plotly charts, which app.py generates in the Chainlit context.
+        
+        # Alerts/warnings
+        alerts_data = detailed_data.get("alerts_data")
+        if alerts_data:
+            features = alerts_data.get("features", [])
+            if features:
+                data_sections.append("\n⚠️ **Active Alerts/Warnings**:")
+                for alert in features:
+                    alert_props = alert.get("properties", {})
+                    event = alert_props.get("event", "Alert")
+                    headline = alert_props.get("headline", "")
+                    severity = alert_props.get("severity", "Unknown")
+                    data_sections.append(f"  • [{severity}] {event}: {headline}")
+            else:
+                data_sections.append("\n✓ No active alerts")
+        else:
+            data_sections.append("\n⚠️ Could not fetch alerts - active warnings unknown")
         
         result = "\n".join(data_sections)
         logger.info("Successfully retrieved comprehensive Stevens Pass data")
@@ -915,6 +999,12 @@ def _save_analysis_prompt(prompt: str, filename: str = "stevens_pass_analysis_pr
         return ""
 
 
+# Powder Poobah posts go up at most a few times a day
+_POWDER_POOBAH_TTL = 1800
+_powder_poobah_cache = {"ts": 0.0, "data": "", "inflight": None}
+_powder_poobah_lock = threading.Lock()
+
+
 def get_powder_poobah_latest_forecast() -> str:
     """
     [HELPER FUNCTION]
@@ -923,7 +1013,31 @@ def get_powder_poobah_latest_forecast() -> str:
     - Short Term Forecast
     - Highlights
     - Extended Outlook
+    
+    Results are cached for _POWDER_POOBAH_TTL seconds so the forecast tool and the
+    snow analysis share one scrape and BeautifulSoup parse; concurrent callers wait
+    on the in-flight scrape instead of starting their own.
     """
+    return _cached_single_flight(
+        _powder_poobah_cache,
+        _powder_poobah_lock,
+        _POWDER_POOBAH_TTL,
+        _scrape_powder_poobah_latest_forecast,
+        # Empty means the scrape failed - don't pin that for the TTL
+        keep=bool,
+    )
+
+
+def clear_powder_poobah_cache() -> None:
+    """Drop the cached Powder Poobah forecast (next call scrapes the site again)"""
+    with _powder_poobah_lock:
+        _powder_poobah_cache["data"] = ""
+        _powder_poobah_cache["ts"] = 0.0
+        _powder_poobah_cache["inflight"] = None
+
+
+def _scrape_powder_poobah_latest_forecast() -> str:
+    """Scrape and extract the latest Powder Poobah post (uncached)"""
     try:
         import re
         from bs4 import BeautifulSoup
@@ -939,7 +1053,7 @@ def get_powder_poobah_latest_forecast() -> str:
         home_response.raise_for_status()
         
         # Parse HTML to find the latest powder alert link
-        soup = BeautifulSoup(home_response.content, 'html.parser')
+        soup = BeautifulSoup(home_response.content, _FAST_HTML_PARSER)
         
         # Find all powder alert post links - they're in the "Powder Alerts" section
         post_links = []
@@ -965,7 +1079,7 @@ def get_powder_poobah_latest_forecast() -> str:
         post_response = session.get(latest_post_url, timeout=timeout)
         post_response.raise_for_status()
         
-        post_soup = BeautifulSoup(post_response.content, 'html.parser')
+        post_soup = BeautifulSoup(post_response.content, _FAST_HTML_PARSER)
         
         # Extract post date/title BEFORE cleaning - try multiple selectors
         title_elem = post_soup.find('h1')
@@ -1196,7 +1310,7 @@ def analyze_snow_forecast_for_stevens_pass() -> str:
             try:
                 afd_response = session.get(afd_url, timeout=timeout)
                 afd_response.raise_for_status()
-                afd_data = afd_response.json()
+                afd_data = _parse_json(afd_response)
                 
                 products = afd_data.get("@graph", [])
                 if products:
@@ -1206,7 +1320,7 @@ def analyze_snow_forecast_for_stevens_pass() -> str:
                     if product_url:
                         product_response = session.get(product_url, timeout=timeout)
                         product_response.raise_for_status()
-                        product_data = product_response.json()
+                        product_data = _parse_json(product_response)
                         
                         afd_full_text = product_data.get("productText", "")
                         issued_time = product_data.get("issuanceTime", "Unknown")
@@ -1279,8 +1393,8 @@ def analyze_snow_forecast_for_stevens_pass() -> str:
             return "⚠️ Could not retrieve enough data for analysis. Please try again."
         
         # Import the LLM to analyze all the data
-        from models.local_llm import UnifiedLLM
-        llm = UnifiedLLM()
+        from models.local_llm import get_shared_llm
+        llm = get_shared_llm()
         
         logger.info("[3/3] Analyzing data with LLM...")
         
@@ -1351,11 +1465,7 @@ OFFICIAL DATA
         # Save the prompt for inspection before sending to LLM
         prompt_filepath = _save_analysis_prompt(analysis_prompt)
         
-        analysis_chunks = []
-        for chunk in llm.generate_stream(analysis_prompt):
-            analysis_chunks.append(chunk)
-        
-        analysis = "".join(analysis_chunks)
+        analysis = llm.generate(analysis_prompt)
         
         # NOTE: Plot generation moved to app.py for proper async context
         # Signal that plots should be generated by including metadata
@@ -1458,8 +1568,8 @@ def get_nwac_avalanche_forecast(zone: str = "stevens-pass") -> str:
         logger.info(f"Extracted {len(page_text)} characters from NWAC page, sending to LLM for analysis")
         
         # Use LLM to extract and summarize the key sections
-        from models.local_llm import UnifiedLLM
-        llm = UnifiedLLM()
+        from models.local_llm import get_shared_llm
+        llm = get_shared_llm()
         
         extraction_prompt = f"""You are analyzing an avalanche forecast page from the Northwest Avalanche Center (NWAC).
 
@@ -1618,7 +1728,7 @@ def get_wsdot_mountain_pass_conditions(pass_name: str = "stevens") -> str:
         session = _create_session_with_retries()
         response = session.get(api_url, timeout=15)
         response.raise_for_status()
-        data = response.json()
+        data = _parse_json(response)
         
         # Map pass names to WSDOT IDs
         pass_mapping = {
@@ -1740,27 +1850,32 @@ tools = [
         name="nwac_avalanche_forecast",
         func=get_nwac_avalanche_forecast,
         description="Get current avalanche forecast from Northwest Avalanche Center (NWAC). Returns: danger ratings (upper/middle/lower elevations), Bottom Line summary, detailed forecast discussion, weather conditions, and backcountry safety information. OPTIONAL parameter: 'zone' (default: 'stevens-pass'). Available zones: 'stevens-pass', 'mt-baker', 'snoqualmie-pass', 'washington-pass', 'mt-rainier', 'white-pass', 'olympics'. Use {} for Stevens Pass default or {'zone': 'mt-baker'} for other areas.",
+        metadata={"cacheable": True},
     ),
 
     Tool(
         name="noaa_area_forecast_discussion",
         func=get_noaa_area_forecast_discussion,
         description="Get professional meteorologist analysis from NOAA Area Forecast Discussions (AFD) covering both sides of Cascades. Returns: synoptic pattern analysis, model discussions, forecaster confidence levels, system timing, and technical weather insights from OTX (Spokane/East Cascades) and SEW (Seattle/West Cascades) offices. Useful for understanding weather patterns, forecast uncertainty, and detailed meteorological reasoning. NO parameters needed - use empty input {}.",
+        metadata={"cacheable": True},
     ),
     Tool(
         name="powder_poobah_forecast",
         func=get_powder_poobah_latest_forecast,
         description="Get the latest Powder Poobah professional snow forecast for Pacific Northwest mountains including short-term forecast, highlights, and extended outlook. Expert analysis from a trusted Pacific Northwest snow forecaster. NO parameters needed - use empty input {}.",
+        metadata={"cacheable": True},
     ),
     Tool(
         name="stevens_pass_comprehensive_weather",
         func=get_comprehensive_stevens_pass_data,
         description="Get comprehensive NOAA weather data for Stevens Pass (Tye Mill, 5180ft elevation). Returns: 14-period text forecast, hourly grid data with snowfall amounts/timing, temperature trends, wind speed/gusts, precipitation, visibility, humidity, and active weather alerts. Best for general weather overview without detailed analysis. NO parameters needed - use empty input {}.",
+        metadata={"cacheable": True},
     ),
     Tool(
         name="stevens_pass_snow_analysis",
         func=analyze_snow_forecast_for_stevens_pass,
         description="PREMIUM comprehensive analysis tool combining ALL sources: NOAA grid data, AFD meteorologist discussions, Powder Poobah expert forecast, NWAC avalanche info, and WSDOT road conditions. Returns: AI-synthesized analysis covering snowfall amounts/timing, snow quality assessment, powder day identification (9+ inches), timing windows, mountain conditions, road access, hazards, and winter sports bottom line. Use this when user asks for complete analysis or snow forecast assessment. Takes ~30 seconds. NO parameters needed - use empty input {}.",
+        metadata={"cacheable": True, "presentational": True},
     ),
     Tool(
         name="wsdot_pass_conditions",
@@ -1779,9 +1894,9 @@ tools = [
 # HELPER FUNCTION UTILITY
 # ============================================================================
 
+_tools_by_name = {tool.name: tool for tool in tools}
+
+
 def get_tool_by_name(name: str) -> Tool | None:
     """Get a tool by name"""
-    for tool in tools:
-        if tool.name == name:
-            return tool
-    return None
+    return _tools_by_name.get(name)